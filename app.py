@@ -1,54 +1,235 @@
-from flask import Flask, render_template, jsonify, request, send_file
-from news_scraper import search_fdi_news, search_fdi_news_by_date
-from summarizer import summarize_article
-from excel_export import export_to_excel
+from flask import Flask, Response, g, render_template, jsonify, request
+from news_scraper import HOST_BREAKER, prefilter_stats, search_fdi_news, search_fdi_news_by_date
+from summarizer import summarize_articles
+from excel_export import iter_csv, write_excel, write_parquet
+from cache import ARTICLE_CACHE, SUMMARY_CACHE
+from jobs import Job, JobQueue
+from news_store import NewsRecord, NewsStore, decode_cursor, encode_cursor
+from dedupe import NearDuplicateIndex, minhash, source_entry
+from deadlines import Deadline, deadline_after
+from backfill import parse_range, run_backfill
+from responses import compress_response, json_provider_class
+from metrics import (
+    Gauge, HTTP_REQUEST_SECONDS, TimingBreakdown, activate_timings, deactivate_timings,
+    render as render_metrics, timed,
+)
+import hashlib
 import os
+import tempfile
+import time
 from datetime import datetime
-from typing import List
+from typing import Callable, Dict, List, Optional
 
 app = Flask(__name__)
 app.config['JSON_AS_ASCII'] = False
+app.json = json_provider_class()(app)
 
-# Store collected news
-collected_news = []
+# Store collected news (SQLite, shared by all workers)
+news_store = NewsStore()
 
+# Background scraping/summarizing jobs; items are summarized and published in
+# batches of this size so the frontend can render them while the job runs
+job_queue = JobQueue()
+JOB_PUBLISH_BATCH = 4
 
-def _prepare_news_items(news_items: List[dict]):
-    """Attach AI summaries and timestamps to news items."""
-    prepared = []
-    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-    for item in news_items:
-        summary = item.get('summary')
-        if not summary:
-            summary = summarize_article(item.get('url', ''), item.get('content'))
-
-        enriched_item = {**item}
-        enriched_item['summary'] = summary
-        enriched_item['collected_at'] = now
-        prepared.append(enriched_item)
-    return prepared
+# Backfills run one at a time on their own worker so they never hold the
+# threads interactive searches are waiting for
+backfill_queue = JobQueue(max_workers=1)
 
+# When ingest.py keeps the store fresh, /api/news/latest only reads from it
+INGEST_DAEMON = os.environ.get('FDI_INGEST_DAEMON', '').lower() in ('1', 'true', 'yes')
+
+# Seconds a search job may take (from the request, queue wait included) before
+# it returns what it has; requests can ask for less, or more up to the maximum
+SEARCH_DEADLINE = float(os.environ.get('FDI_SEARCH_DEADLINE', '90'))
+MAX_SEARCH_DEADLINE = float(os.environ.get('FDI_MAX_SEARCH_DEADLINE', '600'))
+
+
+Gauge(
+    'fdi_cache_requests', 'Cache lookups since start, by cache and result.', ['cache', 'result'],
+    lambda: {
+        (name, result): cache.stats()[result]
+        for name, cache in (('articles', ARTICLE_CACHE), ('summaries', SUMMARY_CACHE))
+        for result in ('hits', 'misses')
+    },
+)
+Gauge(
+    'fdi_host_circuits_open', 'Hosts currently skipped after repeated failed downloads.', [],
+    lambda: {(): len(HOST_BREAKER.open_hosts())},
+)
+
+
+# Flask runs after_request hooks in reverse registration order, so registering
+# compression first makes it the last step, after the timing hook edits the body
+@app.after_request
+def _compress(response):
+    return compress_response(request, response)
+
+
+def _timing_requested() -> bool:
+    return request.args.get('timing', '').lower() in ('1', 'true', 'yes')
+
+
+@app.before_request
+def _start_request_timer():
+    g.request_started = time.perf_counter()
+    if _timing_requested():
+        # Per-request stage breakdown, returned in the JSON body (opt-in: ?timing=1)
+        g.timings = TimingBreakdown()
+        g.timings_token = activate_timings(g.timings)
 
-def _merge_news_items(news_items: List[dict]):
-    """Merge unique news items into the in-memory collection."""
-    global collected_news
-    existing_urls = {item['url']: index for index, item in enumerate(collected_news)}
-    fresh_items = []
 
+@app.after_request
+def _record_request_timing(response):
+    elapsed = time.perf_counter() - g.get('request_started', time.perf_counter())
+    HTTP_REQUEST_SECONDS.observe(
+        elapsed, method=request.method, endpoint=request.endpoint or 'unknown', status=response.status_code
+    )
+    timings = g.get('timings')
+    if timings is not None and response.is_json and not response.is_streamed:
+        body = response.get_json()
+        if isinstance(body, dict):
+            body['timings'] = timings.to_dict()
+            response.set_data(app.json.dumps(body))
+    return response
+
+
+@app.teardown_request
+def _stop_request_timer(exc=None):
+    token = g.pop('timings_token', None)
+    if token is not None:
+        deactivate_timings(token)
+
+
+def _collapse_duplicates(news_items: List[dict]):
+    """
+    Fold near-duplicate copies of a story (syndicated wire copy, republished
+    articles) into one record listing every source, so each story is only
+    summarized and stored once. Earlier items win within the batch.
+    """
+    batch_index = NearDuplicateIndex()
+    # Sources list of each story kept from this batch, which later copies are appended to
+    canonical: Dict[str, List[dict]] = {}
+    # Copies of stories that were already stored; attached to the stored record, whose
+    # sources list must not be replaced by the re-seen item's
+    reseen: Dict[str, List[dict]] = {}
+    unique_items = []
     for item in news_items:
-        url = item.get('url')
-        if not url:
+        signature = minhash(item.get('content', ''))
+        if signature is None:
+            unique_items.append(item)
             continue
-        if url in existing_urls:
-            # Update metadata for existing entries (summary, relevance, etc.)
-            collected_news[existing_urls[url]].update(item)
+
+        batch_url = batch_index.find(signature)
+        if batch_url is not None:
+            canonical[batch_url].append(source_entry(item))
+            continue
+
+        stored_url = news_store.find_near_duplicate(signature)
+        if stored_url is not None and stored_url != item.get('url'):
+            news_store.add_sources(stored_url, [source_entry(item)])
+            continue
+
+        if stored_url is None:
+            item = {**item, 'sources': [source_entry(item)]}
+            news_store.add_signature(item['url'], signature)
+            canonical[item['url']] = item['sources']
         else:
-            fresh_items.append(item)
+            canonical[item['url']] = reseen.setdefault(item['url'], [])
+        batch_index.add(signature, item['url'])
+        unique_items.append(item)
+
+    for url, sources in reseen.items():
+        if sources:
+            news_store.add_sources(url, sources)
+    return unique_items
+
+
+def _prepare_news_items(news_items: List[dict], deadline: Optional[Deadline] = None):
+    """Collapse duplicate stories, then attach AI summaries and timestamps to news items."""
+    with timed('dedupe'):
+        news_items = _collapse_duplicates(news_items)
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    prepared = [{**item, 'collected_at': now} for item in news_items]
 
-    if fresh_items:
-        collected_news = fresh_items + collected_news
+    # Summarize every item that still needs it in a single batched model pass
+    missing = [item for item in prepared if not item.get('summary')]
+    if missing:
+        summaries = summarize_articles(
+            [(item.get('url', ''), item.get('content')) for item in missing], deadline=deadline
+        )
+        for item, summary in zip(missing, summaries):
+            item['summary'] = summary
+    return prepared
+
+
+def _merge_news_items(news_items: List[dict]):
+    """Merge unique news items into the persistent collection."""
+    with timed('store_merge'):
+        return news_store.merge(news_items)
+
+
+def _request_deadline(data: dict) -> float:
+    """The `deadline` (seconds) asked for in a search request, within (0, MAX_SEARCH_DEADLINE]."""
+    seconds = float(SEARCH_DEADLINE if data.get('deadline') is None else data['deadline'])
+    if seconds <= 0:
+        raise ValueError('deadline must be a positive number of seconds')
+    return min(seconds, MAX_SEARCH_DEADLINE)
+
+
+def _run_search_job(job: Job, fetch: Callable[[Deadline], List[dict]], deadline: Deadline,
+                    search_date: Optional[str] = None):
+    """
+    Scrape, then summarize and publish items batch by batch as they become ready.
+
+    Once `deadline` passes, scraping stops with what it found and the rest is
+    summarized extractively; the job is then flagged partial.
+    """
+    job.update(stage='scraping')
+    news_items = fetch(deadline)
+    news_items.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+    job.update(stage='summarizing', total=len(news_items), partial=deadline.partial, cut_stages=deadline.cut_stages)
+
+    for start in range(0, len(news_items), JOB_PUBLISH_BATCH):
+        batch = _prepare_news_items(news_items[start:start + JOB_PUBLISH_BATCH], deadline)
+        if search_date:
+            for item in batch:
+                item['search_date'] = search_date
+        _merge_news_items(batch)
+        # Jobs keep compact records; article text stays in the store
+        job.add_items([NewsRecord.from_dict(item) for item in batch])
+        job.update(partial=deadline.partial, cut_stages=deadline.cut_stages)
+
+
+def _run_backfill_job(job: Job, start, end, restart: bool):
+    """Backfill a date range window by window, publishing each window's items as it is stored."""
+    job.update(stage='backfilling')
 
-    return fresh_items
+    def store(items: List[dict]) -> List[dict]:
+        items.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+        stored = []
+        for batch_start in range(0, len(items), JOB_PUBLISH_BATCH):
+            batch = _prepare_news_items(items[batch_start:batch_start + JOB_PUBLISH_BATCH])
+            stored.extend(_merge_news_items(batch))
+            job.add_items([NewsRecord.from_dict(item) for item in batch])
+        return stored
+
+    run_backfill(
+        start, end, store, restart=restart,
+        progress=lambda done, total: job.update(stage=f'backfilling ({done}/{total} windows)'),
+    )
+
+
+def _job_response(job: Job, cached_items: List[dict], **extra):
+    return jsonify({
+        'success': True,
+        'job_id': job.id,
+        'status': job.status,
+        'partial': job.partial,
+        'news': cached_items,
+        'count': len(cached_items),
+        **extra
+    }), 202
 
 @app.route('/')
 def index():
@@ -56,83 +237,200 @@ def index():
 
 @app.route('/api/search', methods=['POST'])
 def search_news():
-    """Search for FDI news in Latin America"""
+    """Queue a search for FDI news in Latin America"""
     try:
         data = request.json
         query = data.get('query', 'FDI projects Latin America')
         num_results = data.get('num_results', 20)  # Default to 20 for pagination
-        
-        # Search for news
-        news_items = search_fdi_news(query, num_results)
-        news_items = _prepare_news_items(news_items)
-        news_items.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        _merge_news_items(news_items)
-        
-        return jsonify({
-            'success': True,
-            'news': news_items,
-            'count': len(news_items)
-        })
+        try:
+            seconds = _request_deadline(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': f'Invalid deadline: {e}'}), 400
+
+        job = job_queue.submit(
+            'search', _run_search_job,
+            lambda deadline: search_fdi_news(query, num_results, deadline=deadline), deadline_after(seconds)
+        )
+        return _job_response(job, news_store.page(num_results), deadline=seconds)
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+def _collection_etag() -> str:
+    """ETag for a read of the news collection: the store version plus the path and query arguments."""
+    query = '&'.join(f'{k}={v}' for k, v in sorted(request.args.items(multi=True)) if k != 'timing')
+    query_key = hashlib.sha1(f'{request.path}?{query}'.encode('utf-8')).hexdigest()[:16]
+    return f'{news_store.version()}-{query_key}'
+
+def _not_modified(etag: str) -> Response:
+    not_modified = Response(status=304)
+    not_modified.set_etag(etag, weak=True)
+    return not_modified
+
 @app.route('/api/news', methods=['GET'])
 def get_news():
-    """Get all collected news with pagination"""
-    page = request.args.get('page', 1, type=int)
-    per_page = request.args.get('per_page', 10, type=int)
-    
-    # Calculate pagination
-    total = len(collected_news)
-    start = (page - 1) * per_page
-    end = start + per_page
-    paginated_news = collected_news[start:end]
-    
-    return jsonify({
+    """
+    Get collected news, filtered server-side.
+
+    Supports page-number pagination (`page`) or, when `cursor` is given (empty for
+    the first page), keyset pagination that follows `next_cursor`. Filters:
+    country, sector, date_from/date_to (published, YYYY-MM-DD), min_score, origin.
+    Article text is left out unless include_content=1.
+
+    Responses carry an ETag derived from the store version and the query, so
+    pollers sending If-None-Match get an empty 304 while nothing has changed.
+    """
+    etag = _collection_etag()
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+
+    per_page = max(1, min(request.args.get('per_page', 10, type=int), 200))
+    filters = {
+        'country': request.args.get('country'),
+        'sector': request.args.get('sector'),
+        'date_from': request.args.get('date_from'),
+        'date_to': request.args.get('date_to'),
+        'min_score': request.args.get('min_score', type=float),
+        'origin': request.args.get('origin'),
+    }
+    include_content = request.args.get('include_content', '0').lower() in ('1', 'true', 'yes')
+
+    cursor = request.args.get('cursor')
+    if cursor is not None:
+        with timed('store_query'):
+            paginated_news, next_id = news_store.query(
+                per_page, after=decode_cursor(cursor), include_content=include_content, **filters
+            )
+        response = {
+            'next_cursor': encode_cursor(next_id) if next_id is not None else None,
+        }
+    else:
+        page = max(1, request.args.get('page', 1, type=int))
+        with timed('store_query'):
+            paginated_news, _ = news_store.query(
+                per_page, offset=(page - 1) * per_page, include_content=include_content, **filters
+            )
+            total = news_store.count(**filters)
+        response = {
+            'total': total,
+            'page': page,
+            'total_pages': (total + per_page - 1) // per_page
+        }
+
+    result = jsonify({
         'success': True,
         'news': paginated_news,
         'count': len(paginated_news),
-        'total': total,
-        'page': page,
         'per_page': per_page,
-        'total_pages': (total + per_page - 1) // per_page
+        **response
     })
+    result.set_etag(etag, weak=True)
+    result.headers['Cache-Control'] = 'no-cache'
+    return result
+
+@app.route('/api/stats', methods=['GET'])
+def get_stats():
+    """
+    Dashboard aggregates: item counts and summed USD investment per country,
+    sector, source and publish week.
+
+    Served from rollups that NewsStore.merge keeps up to date, so the cost is
+    the same however many items are stored. `limit` caps the country/sector/
+    source lists (largest first), `weeks` the trailing publish weeks. Carries
+    the same version-based ETag as /api/news.
+    """
+    etag = _collection_etag()
+    if request.if_none_match.contains_weak(etag):
+        return _not_modified(etag)
+
+    limit = max(1, min(request.args.get('limit', 20, type=int), 200))
+    weeks = max(1, min(request.args.get('weeks', 52, type=int), 520))
+    with timed('store_stats'):
+        stats = news_store.stats(limit=limit, weeks=weeks)
+
+    result = jsonify({
+        'success': True,
+        'total': stats['total'],
+        'countries': stats['country'],
+        'sectors': stats['sector'],
+        'sources': stats['source'],
+        'weeks': stats['week'],
+    })
+    result.set_etag(etag, weak=True)
+    result.headers['Cache-Control'] = 'no-cache'
+    return result
 
 @app.route('/api/news/latest', methods=['GET'])
 def get_latest_news():
-    """Automatically fetch latest FDI news"""
+    """Queue a fetch of the latest FDI news"""
     try:
+        if INGEST_DAEMON:
+            latest_items = news_store.page(20)
+            return jsonify({
+                'success': True,
+                'news': latest_items,
+                'count': len(latest_items)
+            })
+
         # Search for latest news (last 7 days)
-        news_items = search_fdi_news("FDI foreign direct investment Latin America", 20)
-        news_items = _prepare_news_items(news_items)
-        news_items.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        _merge_news_items(news_items)
-        
-        return jsonify({
-            'success': True,
-            'news': news_items,
-            'count': len(news_items)
-        })
+        job = job_queue.submit(
+            'latest', _run_search_job,
+            lambda deadline: search_fdi_news("FDI foreign direct investment Latin America", 20, deadline=deadline),
+            deadline_after(SEARCH_DEADLINE)
+        )
+        return _job_response(job, news_store.page(20))
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+EXPORT_FORMATS = {
+    'xlsx': (write_excel, 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'),
+    'parquet': (write_parquet, 'application/vnd.apache.parquet'),
+}
+
+
+def _stream_file(handle, chunk_size=64 * 1024):
+    try:
+        while True:
+            chunk = handle.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+    finally:
+        handle.close()
+
+
 @app.route('/api/export', methods=['GET'])
 def export_excel():
-    """Export collected news to Excel"""
+    """Stream collected news as Excel (default), CSV or Parquet"""
     try:
-        filename = export_to_excel(collected_news)
-        return send_file(
-            filename,
-            as_attachment=True,
-            download_name=f'fdi_projects_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx',
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
-        )
+        export_format = request.args.get('format', 'xlsx').lower()
+        download_name = f'fdi_projects_{datetime.now().strftime("%Y%m%d_%H%M%S")}.{export_format}'
+        headers = {'Content-Disposition': f'attachment; filename={download_name}'}
+
+        if export_format == 'csv':
+            return Response(iter_csv(news_store.iter_items()), mimetype='text/csv', headers=headers)
+
+        if export_format not in EXPORT_FORMATS:
+            return jsonify({
+                'success': False,
+                'error': f'Unsupported export format: {export_format}'
+            }), 400
+
+        # Zip-based formats need a seekable file; spool to a temp file and stream it back
+        writer, mimetype = EXPORT_FORMATS[export_format]
+        handle = tempfile.TemporaryFile()
+        try:
+            writer(news_store.iter_items(), handle)
+            handle.seek(0)
+        except Exception:
+            handle.close()
+            raise
+        return Response(_stream_file(handle), mimetype=mimetype, headers=headers)
     except Exception as e:
         return jsonify({
             'success': False,
@@ -152,32 +450,82 @@ def search_news_by_date():
                 'success': False,
                 'error': 'Date is required'
             }), 400
+        try:
+            seconds = _request_deadline(data)
+        except (TypeError, ValueError) as e:
+            return jsonify({'success': False, 'error': f'Invalid deadline: {e}'}), 400
         
         # Search for news on specific date
-        news_items = search_fdi_news_by_date(search_date, num_results)
-        news_items = _prepare_news_items(news_items)
-        for item in news_items:
-            item['search_date'] = search_date
-        news_items.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
-        _merge_news_items(news_items)
-        
+        job = job_queue.submit(
+            'date', _run_search_job,
+            lambda deadline: search_fdi_news_by_date(search_date, num_results, deadline=deadline),
+            deadline_after(seconds), search_date
+        )
+        cached_items = news_store.page(num_results, search_date=search_date)
+        return _job_response(job, cached_items, search_date=search_date, deadline=seconds)
+    except Exception as e:
         return jsonify({
-            'success': True,
-            'news': news_items,
-            'count': len(news_items),
-            'search_date': search_date
-        })
+            'success': False,
+            'error': str(e)
+        }), 500
+
+@app.route('/api/backfill', methods=['POST'])
+def backfill_news():
+    """Queue a backfill of every publish date from `start` through `end` (resumes by default)"""
+    try:
+        data = request.json or {}
+        try:
+            start, end = parse_range(data.get('start'), data.get('end'))
+        except ValueError as e:
+            return jsonify({
+                'success': False,
+                'error': str(e)
+            }), 400
+
+        job = backfill_queue.submit('backfill', _run_backfill_job, start, end, bool(data.get('restart')))
+        return _job_response(job, [], start=data['start'], end=data['end'])
     except Exception as e:
         return jsonify({
             'success': False,
             'error': str(e)
         }), 500
 
+@app.route('/api/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Report job progress and the items it produced after index `since`"""
+    job = job_queue.get(job_id) or backfill_queue.get(job_id)
+    if job is None:
+        return jsonify({
+            'success': False,
+            'error': 'Job not found'
+        }), 404
+
+    since = request.args.get('since', 0, type=int)
+    return jsonify({
+        'success': True,
+        'job': job.snapshot(since, include_timings=_timing_requested())
+    })
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    """Report cache sizes, hit/miss counters, downloads saved by the feed prefilter and skipped hosts"""
+    return jsonify({
+        'success': True,
+        'articles': ARTICLE_CACHE.stats(),
+        'summaries': SUMMARY_CACHE.stats(),
+        'prefilter': dict(prefilter_stats),
+        'skipped_hosts': HOST_BREAKER.open_hosts()
+    })
+
+@app.route('/metrics', methods=['GET'])
+def metrics():
+    """Pipeline counters and latency histograms in the Prometheus text format"""
+    return Response(render_metrics(), mimetype='text/plain; version=0.0.4')
+
 @app.route('/api/clear', methods=['POST'])
 def clear_news():
     """Clear collected news"""
-    global collected_news
-    collected_news = []
+    news_store.clear()
     return jsonify({'success': True, 'message': 'News cleared'})
 
 if __name__ == '__main__':
@@ -0,0 +1,122 @@
+"""
+Date-range backfill.
+
+Collects the FDI news published between two dates into the shared news store.
+The range is split into windows of FDI_BACKFILL_WINDOW_DAYS days; each window
+polls date-bounded (after:/before:) feed queries once, buckets the entries by
+publish day and scrapes every unique URL once, instead of one generic feed
+download and scrape per day. Finished windows are checkpointed, so rerunning an
+interrupted backfill resumes where it stopped:
+
+    python backfill.py --start 2024-01-01 --end 2024-01-31
+    python backfill.py --start 2024-01-01 --end 2024-01-31 --restart   # ignore the checkpoint
+
+The web app runs the same backfill as a job via POST /api/backfill.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+from datetime import date, datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+from cache import CACHE_PATH, PersistentCache
+from news_scraper import date_windows, scrape_date_range
+
+BACKFILL_WINDOW_DAYS = int(os.environ.get('FDI_BACKFILL_WINDOW_DAYS', '7'))
+MAX_BACKFILL_DAYS = int(os.environ.get('FDI_MAX_BACKFILL_DAYS', '366'))
+
+# Per-range progress: finished windows, items stored and relevant items per day
+BACKFILL_STATE = PersistentCache(CACHE_PATH, 'backfill_state', ttl=None, max_entries=1000)
+
+
+def parse_range(start: Optional[str], end: Optional[str]) -> Tuple[date, date]:
+    """Validate a YYYY-MM-DD range; raises ValueError with a message fit for the user."""
+    if not start or not end:
+        raise ValueError('start and end dates are required')
+    try:
+        first = datetime.strptime(start, '%Y-%m-%d').date()
+        last = datetime.strptime(end, '%Y-%m-%d').date()
+    except ValueError:
+        raise ValueError('dates must be formatted YYYY-MM-DD') from None
+    if first > last:
+        raise ValueError('start must not be after end')
+    if last > date.today():
+        raise ValueError('end must not be in the future')
+    if (last - first).days + 1 > MAX_BACKFILL_DAYS:
+        raise ValueError(f'ranges are limited to {MAX_BACKFILL_DAYS} days')
+    return first, last
+
+
+def _state_key(start: date, end: date, window_days: int) -> str:
+    return f'{start:%Y-%m-%d}:{end:%Y-%m-%d}:{window_days}'
+
+
+def run_backfill(start: date, end: date, store: Callable[[List[Dict]], List], restart: bool = False,
+                 window_days: int = BACKFILL_WINDOW_DAYS,
+                 progress: Optional[Callable[[int, int], None]] = None) -> Dict:
+    """
+    Backfill `start`..`end` window by window, handing each window's items to `store`.
+
+    `store` persists a list of items and returns the ones that were new. A window
+    is checkpointed only after `store` returns, so a crash retries it. `progress`
+    is called with (finished windows, total windows). Returns the final state.
+    """
+    key = _state_key(start, end, window_days)
+    state = {} if restart else BACKFILL_STATE.get(key) or {}
+    completed = list(state.get('completed', []))
+    per_day = dict(state.get('days', {}))
+    stored = state.get('stored', 0)
+
+    windows = date_windows(start, end, window_days)
+    seen: set = set()
+    for index, (window_start, window_end) in enumerate(windows):
+        window_key = window_start.strftime('%Y-%m-%d')
+        if window_key not in completed:
+            by_day = scrape_date_range(window_start, window_end, seen)
+            items = [item for day in sorted(by_day) for item in by_day[day]]
+            stored += len(store(items)) if items else 0
+            per_day.update({day: len(day_items) for day, day_items in by_day.items()})
+            completed.append(window_key)
+            state = {'completed': completed, 'days': per_day, 'stored': stored}
+            BACKFILL_STATE.set(key, state)
+        if progress is not None:
+            progress(index + 1, len(windows))
+
+    return {'completed': completed, 'days': per_day, 'stored': stored, 'windows': len(windows)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Backfill FDI news for a range of publish dates.')
+    parser.add_argument('--start', required=True, help='first publish date, YYYY-MM-DD')
+    parser.add_argument('--end', required=True, help='last publish date, YYYY-MM-DD')
+    parser.add_argument('--window-days', type=int, default=BACKFILL_WINDOW_DAYS, help='days per query window')
+    parser.add_argument('--restart', action='store_true', help='ignore the checkpoint and start over')
+    args = parser.parse_args()
+
+    try:
+        start, end = parse_range(args.start, args.end)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    from app import _merge_news_items, _prepare_news_items
+
+    def store(items: List[Dict]) -> List:
+        items.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+        return _merge_news_items(_prepare_news_items(items))
+
+    started = time.monotonic()
+    state = run_backfill(
+        start, end, store, restart=args.restart, window_days=args.window_days,
+        progress=lambda done, total: print(f"Backfill window {done}/{total} done"),
+    )
+    print(f"Backfilled {args.start}..{args.end}: {state['stored']} new items over "
+          f"{len(state['days'])} days in {time.monotonic() - started:.1f}s")
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,268 @@
+"""
+Offline performance benchmark of the scraping/summarizing pipeline.
+
+Serves the recorded feed and article fixtures in benchmarks/fixtures from a
+local stub server, then times each stage separately at several collection
+sizes and writes the results as JSON so runs can be compared:
+
+    python benchmark.py                              # sizes 10, 100, 500
+    python benchmark.py --sizes 50,1000 --transformer
+    python benchmark.py --compare benchmarks/results/benchmark-20240312-101500.json
+
+Caches and the news store live in a temporary directory, so a run never reads
+or touches data/. Peak memory is the Python heap peak per stage (tracemalloc),
+plus the process max RSS for the whole run.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+import xml.etree.ElementTree as ET
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'benchmarks', 'fixtures')
+RESULTS_DIR = os.path.join('benchmarks', 'results')
+DEFAULT_SIZES = '10,100,500'
+
+STAGES = [
+    'feed_parse', 'article_parse', 'build_news_item', 'match_keywords', 'match_keywords_reference',
+    'extract_entities', 'extract_entities_reference',
+    'summarize_extractive', 'summarize_transformer', 'merge_news_items', 'export_to_excel',
+]
+
+
+class FixtureServer:
+    """Local HTTP stub serving an N-entry feed and fixture article pages."""
+
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR):
+        self.feed_template = ET.parse(os.path.join(fixtures_dir, 'feed.xml'))
+        self.articles = {}
+        articles_dir = os.path.join(fixtures_dir, 'articles')
+        for name in sorted(os.listdir(articles_dir)):
+            with open(os.path.join(articles_dir, name), 'rb') as handle:
+                self.articles[os.path.splitext(name)[0]] = handle.read()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                if parsed.path == '/rss':
+                    size = int(parse_qs(parsed.query).get('n', ['10'])[0])
+                    self._send(200, 'application/rss+xml; charset=utf-8', server.render_feed(size))
+                elif parsed.path.startswith('/articles/'):
+                    slug = parsed.path.split('/')[2]
+                    body = server.articles.get(slug)
+                    self._send(200 if body else 404, 'text/html; charset=utf-8', body or b'not found')
+                else:
+                    self._send(404, 'text/plain', b'not found')
+
+            def _send(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.base_url = f'http://127.0.0.1:{self.httpd.server_address[1]}'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def render_feed(self, size: int) -> bytes:
+        """The fixture feed with its items cycled to `size` entries, each linking to a unique URL."""
+        root = ET.fromstring(ET.tostring(self.feed_template.getroot()))
+        channel = root.find('channel')
+        templates = channel.findall('item')
+        for item in templates:
+            channel.remove(item)
+
+        for index in range(size):
+            item = ET.fromstring(ET.tostring(templates[index % len(templates)]))
+            slug = item.find('guid').text
+            link = f'{self.base_url}/articles/{slug}/{index}'
+            item.find('link').text = link
+            item.find('guid').text = link
+            if index >= len(templates):
+                item.find('title').text = f"{item.find('title').text} ({index})"
+            channel.append(item)
+        return ET.tostring(root, encoding='utf-8', xml_declaration=True)
+
+    def feed_url(self, size: int) -> str:
+        return f'{self.base_url}/rss?n={size}'
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+
+
+def _measure(func: Callable, items: int, track_memory: bool) -> Tuple[object, Dict]:
+    if track_memory:
+        tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    stats = {
+        'items': items,
+        'seconds': round(seconds, 6),
+        'items_per_second': round(items / seconds, 2) if seconds > 0 else None,
+        'us_per_item': round(seconds / items * 1e6, 1) if items else None,
+    }
+    if track_memory:
+        stats['peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 2 ** 20, 3)
+        tracemalloc.stop()
+    return result, stats
+
+
+def run_size(server: FixtureServer, size: int, transformer: bool, track_memory: bool) -> Dict[str, Dict]:
+    """Run every stage once over a collection of `size` feed entries."""
+    import feedparser
+    import requests
+
+    from app import _merge_news_items, news_store
+    from cache import download_article
+    from entities import _reference_amount_and_company, extract_entities
+    from excel_export import export_to_excel
+    from news_scraper import (
+        _reference_countries_and_sectors, _reference_score_article_relevance, build_news_item, match_article,
+    )
+    from summarizer import extractive_summaries, generate_ai_summaries
+
+    results = {}
+    feed_bytes = requests.get(server.feed_url(size), timeout=30).content
+
+    parsed, results['feed_parse'] = _measure(lambda: feedparser.parse(feed_bytes), size, track_memory)
+    entries = parsed.entries
+
+    def parse_articles():
+        return [(entry, download_article(entry.link)) for entry in entries]
+
+    articles, results['article_parse'] = _measure(parse_articles, len(entries), track_memory)
+
+    def build_items():
+        return [
+            build_news_item(
+                title=entry.get('title', ''),
+                url=entry.link,
+                summary=article.text[:600],
+                published=entry.get('published', ''),
+                source=entry.get('source', {}).get('title', 'Google News'),
+                text=article.text,
+            )
+            for entry, article in articles
+        ]
+
+    news_items, results['build_news_item'] = _measure(build_items, len(articles), track_memory)
+    contents = [item['content'] for item in news_items]
+
+    # One keyword scan per article, against the separate relevance and country/sector passes it replaced
+    titled = [(item['title'], item['content'][:600], item['content']) for item in news_items]
+    _, results['match_keywords'] = _measure(
+        lambda: [match_article(*article) for article in titled], len(titled), track_memory
+    )
+    _, results['match_keywords_reference'] = _measure(
+        lambda: [(_reference_score_article_relevance(*article), _reference_countries_and_sectors(article[2]))
+                 for article in titled],
+        len(titled), track_memory,
+    )
+
+    # Amount/company extraction alone, against the inline findall() version it replaced
+    _, results['extract_entities'] = _measure(
+        lambda: [extract_entities(text) for text in contents], len(contents), track_memory
+    )
+    _, results['extract_entities_reference'] = _measure(
+        lambda: [_reference_amount_and_company(text) for text in contents], len(contents), track_memory
+    )
+
+    _, results['summarize_extractive'] = _measure(lambda: extractive_summaries(contents), len(contents), track_memory)
+    if transformer:
+        _, results['summarize_transformer'] = _measure(lambda: generate_ai_summaries(contents), len(contents), track_memory)
+    else:
+        results['summarize_transformer'] = {'skipped': 'pass --transformer to load the model'}
+
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    stored_items = [{**item, 'collected_at': now} for item in news_items]
+    news_store.clear()
+    _, results['merge_news_items'] = _measure(lambda: _merge_news_items(stored_items), len(stored_items), track_memory)
+
+    with tempfile.TemporaryDirectory() as export_dir:
+        filename = os.path.join(export_dir, 'export.xlsx')
+        _, results['export_to_excel'] = _measure(lambda: export_to_excel(stored_items, filename), len(stored_items), track_memory)
+    return results
+
+
+def _print_table(results: Dict, baseline: Optional[Dict] = None) -> None:
+    for size, stages in results['sizes'].items():
+        print(f"\n{size} entries")
+        for stage in STAGES:
+            stats = stages.get(stage, {})
+            if 'seconds' not in stats:
+                print(f"  {stage:<26} skipped")
+                continue
+            line = (f"  {stage:<26} {stats['seconds']:>9.3f}s {stats['items_per_second'] or 0:>10.1f}/s"
+                    f" {stats.get('us_per_item') or 0:>10.1f}us/item")
+            if 'peak_mb' in stats:
+                line += f" {stats['peak_mb']:>9.2f} MB"
+            previous = ((baseline or {}).get('sizes', {}).get(size, {}).get(stage) or {}).get('seconds')
+            if previous:
+                line += f"   x{stats['seconds'] / previous:.2f} vs baseline"
+            print(line)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the pipeline stages against offline fixtures.')
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help='comma-separated collection sizes')
+    parser.add_argument('--transformer', action='store_true', help='also time transformer summarization')
+    parser.add_argument('--no-memory', action='store_true', help='skip tracemalloc (lower timing overhead)')
+    parser.add_argument('--output', help='results JSON path (default: benchmarks/results/benchmark-<time>.json)')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',') if size.strip()]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Point every cache and store at the scratch directory before the project modules load
+        os.environ['FDI_CACHE_PATH'] = os.path.join(workdir, 'cache.sqlite3')
+        os.environ['FDI_NEWS_DB_PATH'] = os.path.join(workdir, 'news.sqlite3')
+
+        server = FixtureServer()
+        try:
+            results = {
+                'started_at': datetime.now().isoformat(timespec='seconds'),
+                'python': sys.version.split()[0],
+                'platform': platform.platform(),
+                'sizes': {},
+            }
+            for size in sizes:
+                print(f"Benchmarking {size} entries...")
+                results['sizes'][str(size)] = run_size(server, size, args.transformer, not args.no_memory)
+            results['max_rss_mb'] = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+        finally:
+            server.close()
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as handle:
+            baseline = json.load(handle)
+    _print_table(results, baseline)
+
+    output = args.output or os.path.join(RESULTS_DIR, f"benchmark-{datetime.now().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(output) or '.', exist_ok=True)
+    with open(output, 'w') as handle:
+        json.dump(results, handle, indent=2)
+    print(f"\nResults saved to {output} (max RSS {results['max_rss_mb']} MB)")
+
+
+if __name__ == '__main__':
+    main()
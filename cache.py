@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from newspaper import Article
+
+CACHE_PATH = os.environ.get('FDI_CACHE_PATH', 'data/cache.sqlite3')
+ARTICLE_CACHE_TTL = float(os.environ.get('FDI_ARTICLE_CACHE_TTL', str(24 * 3600)))
+ARTICLE_CACHE_MAX_ENTRIES = int(os.environ.get('FDI_ARTICLE_CACHE_MAX_ENTRIES', '5000'))
+SUMMARY_CACHE_MAX_ENTRIES = int(os.environ.get('FDI_SUMMARY_CACHE_MAX_ENTRIES', '10000'))
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """Open a SQLite database in WAL mode, creating its directory if needed."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute('PRAGMA journal_mode=WAL')
+    return conn
+
+
+class PersistentCache:
+    """
+    SQLite-backed key/value cache with optional TTL and LRU eviction.
+
+    Values are JSON-serializable dicts. One instance maps to one table, so several
+    caches can share the same database file. Safe to use from multiple threads;
+    separate processes (gunicorn workers) share entries through the file.
+    """
+
+    def __init__(self, path: str, table: str, ttl: Optional[float] = None, max_entries: int = 1000):
+        self.path = path
+        self.table = table
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Reconnect after fork so workers never share a connection handle
+        if self._conn is None or self._pid != os.getpid():
+            conn = connect(self.path)
+            conn.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.table} ('
+                'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+                'created_at REAL NOT NULL, last_access REAL NOT NULL)'
+            )
+            conn.execute(f'CREATE INDEX IF NOT EXISTS idx_{self.table}_last_access ON {self.table} (last_access)')
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            conn = self._connection()
+            row = conn.execute(f'SELECT value, created_at FROM {self.table} WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+
+            value, created_at = row
+            if self.ttl is not None and now - created_at > self.ttl:
+                conn.execute(f'DELETE FROM {self.table} WHERE key = ?', (key,))
+                conn.commit()
+                self.misses += 1
+                return None
+
+            conn.execute(f'UPDATE {self.table} SET last_access = ? WHERE key = ?', (now, key))
+            conn.commit()
+            self.hits += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Dict) -> None:
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                f'INSERT OR REPLACE INTO {self.table} (key, value, created_at, last_access) VALUES (?, ?, ?, ?)',
+                (key, payload, now, now),
+            )
+            self._evict(conn, now)
+            conn.commit()
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        if self.ttl is not None:
+            conn.execute(f'DELETE FROM {self.table} WHERE created_at < ?', (now - self.ttl,))
+        (count,) = conn.execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()
+        overflow = count - self.max_entries
+        if overflow > 0:
+            conn.execute(
+                f'DELETE FROM {self.table} WHERE key IN '
+                f'(SELECT key FROM {self.table} ORDER BY last_access ASC LIMIT ?)',
+                (overflow,),
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute(f'DELETE FROM {self.table}')
+            conn.commit()
+
+    def stats(self) -> Dict:
+        with self._lock:
+            (count,) = self._connection().execute(f'SELECT COUNT(*) FROM {self.table}').fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': count,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+        }
+
+
+@dataclass
+class ParsedArticle:
+    """The parts of a newspaper Article the scraper and summarizer use."""
+
+    url: str
+    title: str
+    text: str
+    publish_date: Optional[datetime] = None
+
+    def to_dict(self) -> Dict:
+        return {
+            'url': self.url,
+            'title': self.title,
+            'text': self.text,
+            'publish_date': self.publish_date.isoformat() if self.publish_date else None,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'ParsedArticle':
+        publish_date = data.get('publish_date')
+        return cls(
+            url=data['url'],
+            title=data.get('title') or '',
+            text=data.get('text') or '',
+            publish_date=datetime.fromisoformat(publish_date) if publish_date else None,
+        )
+
+
+ARTICLE_CACHE = PersistentCache(
+    CACHE_PATH, 'articles', ttl=ARTICLE_CACHE_TTL, max_entries=ARTICLE_CACHE_MAX_ENTRIES
+)
+
+# Summaries don't go stale: the key already covers text, model and parameters
+SUMMARY_CACHE = PersistentCache(CACHE_PATH, 'summaries', ttl=None, max_entries=SUMMARY_CACHE_MAX_ENTRIES)
+
+
+def download_article(url: str, timeout: Optional[float] = None) -> ParsedArticle:
+    # newspaper applies request_timeout to the HTTP download (default 7s)
+    article = Article(url, request_timeout=timeout) if timeout is not None else Article(url)
+    article.download()
+    article.parse()
+    return ParsedArticle(
+        url=url,
+        title=article.title or '',
+        text=article.text or '',
+        publish_date=article.publish_date,
+    )
+
+
+def get_article(url: str, download: Optional[Callable[[str], ParsedArticle]] = None,
+                timeout: Optional[float] = None) -> ParsedArticle:
+    """
+    Return the parsed article for a URL, downloading it only on a cache miss.
+
+    `download` replaces the plain download_article(url, timeout) call, for
+    callers that gate, redirect or time the request themselves.
+    """
+    cached = ARTICLE_CACHE.get(url)
+    if cached is not None:
+        return ParsedArticle.from_dict(cached)
+
+    article = download(url) if download is not None else download_article(url, timeout=timeout)
+    ARTICLE_CACHE.set(url, article.to_dict())
+    return article
@@ -0,0 +1,65 @@
+"""
+Request-level time budgets.
+
+A Deadline is created when a search starts and handed down through source
+gathering, article downloads and summarization. Each stage bounds its waits
+by `remaining()` and, when it has to stop early, calls `cut()` so the caller
+can report the results it got back as partial.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from typing import List, Optional
+
+# Shortest timeout handed to a network call; below this a request can't even connect
+MIN_TIMEOUT = 0.5
+
+
+class Deadline:
+    """A monotonic-clock budget shared by every stage of one search (unlimited when seconds is None)."""
+
+    def __init__(self, seconds: Optional[float] = None):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds if seconds is not None else None
+        self._cut: List[str] = []
+        self._lock = threading.Lock()
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left (never negative), or None when there is no deadline."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.monotonic() >= self.expires_at
+
+    def timeout(self, cap: Optional[float]) -> Optional[float]:
+        """A network timeout of at most `cap` that also ends with the deadline."""
+        remaining = self.remaining()
+        if remaining is None:
+            return cap
+        bounded = remaining if cap is None else min(cap, remaining)
+        return max(MIN_TIMEOUT, bounded)
+
+    def cut(self, stage: str) -> None:
+        """Record that `stage` stopped early because the budget ran out."""
+        with self._lock:
+            if stage not in self._cut:
+                self._cut.append(stage)
+
+    @property
+    def partial(self) -> bool:
+        with self._lock:
+            return bool(self._cut)
+
+    @property
+    def cut_stages(self) -> List[str]:
+        with self._lock:
+            return list(self._cut)
+
+
+def deadline_after(seconds: Optional[float]) -> Deadline:
+    """A Deadline `seconds` from now; None or a non-positive value means no deadline."""
+    return Deadline(seconds if seconds is not None and seconds > 0 else None)
@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import random
+import re
+from hashlib import blake2b
+from typing import Dict, List, Optional, Tuple
+
+SHINGLE_SIZE = 3
+MIN_WORDS = 30
+
+# MinHash signature of NUM_PERM values, indexed as LSH_BANDS bands of
+# LSH_ROWS values. Two texts share a band bucket with high probability once
+# their shingle Jaccard similarity passes ~(1/LSH_BANDS) ** (1/LSH_ROWS) = 0.5,
+# so bucket lookups find candidates without scanning the collection; each
+# candidate is then confirmed against SIMILARITY_THRESHOLD.
+NUM_PERM = 64
+LSH_BANDS = 16
+LSH_ROWS = NUM_PERM // LSH_BANDS
+SIMILARITY_THRESHOLD = 0.7
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(1729)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)
+]
+_WORD_RE = re.compile(r'\w+')
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def minhash(text: str) -> Optional[List[int]]:
+    """MinHash signature over word shingles, or None when the text is too short to compare."""
+    words = _WORD_RE.findall((text or '').lower())
+    if len(words) < MIN_WORDS:
+        return None
+
+    hashes = {_hash64(' '.join(words[i:i + SHINGLE_SIZE])) for i in range(len(words) - SHINGLE_SIZE + 1)}
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def similarity(a: List[int], b: List[int]) -> float:
+    """Estimated Jaccard similarity of the shingle sets behind two signatures."""
+    return sum(1 for x, y in zip(a, b) if x == y) / NUM_PERM
+
+
+def lsh_buckets(signature: List[int]) -> List[Tuple[int, int]]:
+    """(band number, bucket) pairs used as index keys; buckets fit a signed 64-bit column."""
+    buckets = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS]
+        buckets.append((band, _hash64(','.join(map(str, rows))) >> 1))
+    return buckets
+
+
+def encode_signature(signature: List[int]) -> str:
+    return ','.join(format(value, 'x') for value in signature)
+
+
+def decode_signature(encoded: str) -> List[int]:
+    return [int(value, 16) for value in encoded.split(',')]
+
+
+def source_entry(item: Dict) -> Dict:
+    return {
+        'url': item.get('url', ''),
+        'source': item.get('source', ''),
+        'title': item.get('title', ''),
+        'published': item.get('published', ''),
+    }
+
+
+class NearDuplicateIndex:
+    """In-memory LSH index of signatures, used to cluster one batch of items."""
+
+    def __init__(self):
+        self._buckets: Dict[Tuple[int, int], List[str]] = {}
+        self._signatures: Dict[str, List[int]] = {}
+
+    def find(self, signature: List[int]) -> Optional[str]:
+        for key in lsh_buckets(signature):
+            for url in self._buckets.get(key, []):
+                if similarity(self._signatures[url], signature) >= SIMILARITY_THRESHOLD:
+                    return url
+        return None
+
+    def add(self, signature: List[int], url: str) -> None:
+        self._signatures[url] = signature
+        for key in lsh_buckets(signature):
+            self._buckets.setdefault(key, []).append(url)
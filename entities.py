@@ -0,0 +1,194 @@
+"""
+Entity extraction for news items: investment amounts and company names.
+
+Patterns are compiled once at import and searched for their first match only,
+since an item keeps a single amount and company. Amounts need a currency marker
+(US$, R$, USD, "dólares", "mdd", ...), so bare numbers such as years or counts
+are never taken for money. They are normalized to a numeric USD value,
+understanding English, Spanish and Portuguese number and scale formats
+("US$1.5 billion", "US$ 1.500 millones", "R$ 2,5 bilhões", "300 mdd").
+"""
+from __future__ import annotations
+
+import os
+import re
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+# Approximate USD value of one unit of each currency, for ranking and totals
+# rather than accounting; override with FDI_USD_RATES="BRL=0.18,MXN=0.05"
+USD_RATES: Dict[str, float] = {
+    'USD': 1.0, 'EUR': 1.08, 'GBP': 1.27, 'BRL': 0.19, 'MXN': 0.055,
+    'CLP': 0.00105, 'COP': 0.00025, 'ARS': 0.0011, 'PEN': 0.27,
+}
+USD_RATES.update({
+    code.strip().upper(): float(rate)
+    for code, _, rate in (
+        pair.partition('=') for pair in os.environ.get('FDI_USD_RATES', '').split(',') if '=' in pair
+    )
+})
+
+_PREFIX_CURRENCIES = {
+    'us$': 'USD', 'u$s': 'USD', 'usd': 'USD', '$': 'USD', 'r$': 'BRL', 'brl': 'BRL', 'mx$': 'MXN',
+    'mxn': 'MXN', 'clp': 'CLP', 'cop': 'COP', 'ars': 'ARS', 'pen': 'PEN', 's/': 'PEN', 's/.': 'PEN',
+    'eur': 'EUR', '€': 'EUR', 'gbp': 'GBP', '£': 'GBP',
+}
+# A currency word after the number wins over a bare "$" prefix ("$ 900 millones de pesos
+# chilenos"); plain "pesos" names no single currency, so it leaves the amount unconverted
+_SUFFIX_CURRENCIES = {
+    'dollars': 'USD', 'dólares': 'USD', 'dolares': 'USD', 'dólares estadounidenses': 'USD', 'usd': 'USD',
+    'reais': 'BRL', 'euros': 'EUR', 'soles': 'PEN', 'pesos': '', 'pesos mexicanos': 'MXN',
+    'pesos chilenos': 'CLP', 'pesos colombianos': 'COP', 'pesos argentinos': 'ARS',
+}
+# Mexican press abbreviations: millones de dólares, miles de millones de dólares, millones de pesos
+_ABBREVIATIONS = {'mdd': (1e6, 'USD'), 'mmdd': (1e9, 'USD'), 'mdp': (1e6, 'MXN')}
+
+# Spanish "billón" is 10^12; Portuguese "bilhão" and English "billion" are 10^9
+_SCALES = {
+    'k': 1e3, 'thousand': 1e3, 'mil': 1e3,
+    'm': 1e6, 'mn': 1e6, 'mln': 1e6, 'million': 1e6, 'millón': 1e6, 'millon': 1e6, 'millones': 1e6,
+    'mi': 1e6, 'milhão': 1e6, 'milhao': 1e6, 'milhões': 1e6, 'milhoes': 1e6,
+    'b': 1e9, 'bn': 1e9, 'billion': 1e9, 'bi': 1e9, 'bilhão': 1e9, 'bilhao': 1e9, 'bilhões': 1e9,
+    'bilhoes': 1e9, 'mil millones': 1e9, 'mil milhões': 1e9, 'mil milhoes': 1e9,
+    'tn': 1e12, 'trillion': 1e12, 'billón': 1e12, 'billon': 1e12, 'billones': 1e12,
+    'trilhão': 1e12, 'trilhao': 1e12, 'trilhões': 1e12, 'trilhoes': 1e12,
+}
+_ENGLISH_SCALES = frozenset({'k', 'thousand', 'm', 'mn', 'mln', 'million', 'b', 'bn', 'billion', 'tn', 'trillion'})
+
+_NUMBER = r'\d{1,3}(?:[.,]\d{3})+(?:[.,]\d+)?|\d+(?:[.,]\d+)?'
+# Longest alternatives first so "mil millones" isn't read as "mil"
+_SCALE = '|'.join(re.escape(scale).replace(r'\ ', r'\s+') for scale in sorted(_SCALES, key=len, reverse=True))
+_SUFFIX = '|'.join(
+    re.escape(suffix).replace(r'\ ', r'\s+') for suffix in sorted(_SUFFIX_CURRENCIES, key=len, reverse=True)
+)
+_PREFIX = r'US\$|U\$S|USD|R\$|MX\$|MXN|BRL|CLP|COP|ARS|PEN|EUR|GBP|S/\.?|€|£|\$'
+
+# Either a currency prefix before the number, or a currency word/abbreviation after it
+_AMOUNT_RE = re.compile(
+    rf'''
+    (?<![\w$])(?P<prefix>{_PREFIX})\s?(?P<a_number>{_NUMBER})
+    (?:\s?(?P<a_scale>{_SCALE})(?!\w))?
+    (?:\s?(?P<a_abbrev>mmdd|mdd|mdp)(?!\w))?
+    (?:\s+(?:de\s+)?(?P<a_suffix>{_SUFFIX})(?!\w))?
+    |
+    (?<![\w.,])(?P<b_number>{_NUMBER})
+    (?:\s?(?P<b_scale>{_SCALE})(?!\w))?
+    (?:\s?(?P<b_abbrev>mmdd|mdd|mdp)(?!\w)|\s+(?:de\s+)?(?P<b_suffix>{_SUFFIX})(?!\w))
+    ''',
+    re.IGNORECASE | re.VERBOSE,
+)
+
+_CAPITALIZED = r"[A-ZÁÉÍÓÚÑÇÂÊÔÃÕ][\w&'.-]*"
+_COMPANY_SUFFIX = (
+    r'S\.A\.B\.\s+de\s+C\.V\.|S\.A\.\s+de\s+C\.V\.|S\.A\.S\.|S\.A\.|SA|Corp(?:oration)?\.?|Inc\.?|LLC|'
+    r'Ltda\.?|Ltd\.?|PLC|Group|Holdings|AG|SE|GmbH'
+)
+# Up to five capitalized words directly followed by a legal-form suffix ("Grupo Bimbo S.A.B. de C.V.")
+_COMPANY_RE = re.compile(rf"(?<!\w)((?:{_CAPITALIZED}\s+){{0,4}}?{_CAPITALIZED})\s+(?:{_COMPANY_SUFFIX})(?!\w)")
+# Most articles name no legal form at all; finding the first suffix is a much cheaper scan,
+# and the company search then only starts this many characters before it
+_COMPANY_SUFFIX_RE = re.compile(rf"\s(?:{_COMPANY_SUFFIX})(?!\w)")
+_COMPANY_LOOKBACK = 200
+_LEADING_ARTICLES = frozenset({'The', 'A', 'An', 'El', 'La', 'Los', 'Las', 'O', 'Os', 'As'})
+_SPACES_RE = re.compile(r'\s+')
+
+
+@dataclass(frozen=True)
+class Amount:
+    """A money amount as written, its value in `currency` and that value in USD (None if unknown)."""
+
+    text: str
+    value: float
+    currency: str
+    usd: Optional[float]
+
+
+def _to_number(number: str, english: bool) -> float:
+    """Parse "1,500.5", "1.500,5", "2,5" or "1.125" given whether the scale word was English."""
+    last_dot, last_comma = number.rfind('.'), number.rfind(',')
+    if last_dot >= 0 and last_comma >= 0:
+        decimal = '.' if last_dot > last_comma else ','
+    elif last_dot >= 0 or last_comma >= 0:
+        separator = '.' if last_dot >= 0 else ','
+        head, _, tail = number.rpartition(separator)
+        if separator in head or len(tail) != 3:
+            # Repeated separators group thousands; anything but 3 trailing digits is a fraction
+            decimal = separator if separator not in head else None
+        else:
+            # "1.125 billion" is English decimal; "1.500 millones" and "1,500 millones" group thousands
+            decimal = '.' if english and separator == '.' else None
+    else:
+        decimal = None
+    thousands = {'.', ','} - {decimal}
+    cleaned = ''.join(char for char in number if char not in thousands)
+    return float(cleaned.replace(',', '.') if decimal == ',' else cleaned)
+
+
+def _key(value: Optional[str]) -> str:
+    return _SPACES_RE.sub(' ', value.lower()) if value else ''
+
+
+def _amount_from_match(match: re.Match) -> Amount:
+    branch = 'a_' if match.group('a_number') else 'b_'
+    scale = _key(match.group(branch + 'scale'))
+    abbrev = _key(match.group(branch + 'abbrev'))
+    suffix = _key(match.group(branch + 'suffix'))
+    prefix = _key(match.group('prefix')) if branch == 'a_' else ''
+
+    multiplier = _SCALES.get(scale, 1.0)
+    currency = _PREFIX_CURRENCIES.get(prefix, '')
+    if abbrev:
+        abbrev_multiplier, currency = _ABBREVIATIONS[abbrev]
+        multiplier *= abbrev_multiplier
+    if suffix and (not currency or prefix == '$'):
+        currency = _SUFFIX_CURRENCIES[suffix]
+
+    value = _to_number(match.group(branch + 'number'), english=scale in _ENGLISH_SCALES) * multiplier
+    rate = USD_RATES.get(currency)
+    return Amount(
+        text=match.group(0).strip(),
+        value=value,
+        currency=currency,
+        usd=round(value * rate, 2) if rate is not None else None,
+    )
+
+
+def find_amount(text: str) -> Optional[Amount]:
+    """The first money amount in `text`, or None."""
+    match = _AMOUNT_RE.search(text or '')
+    return _amount_from_match(match) if match else None
+
+
+def find_company(text: str) -> str:
+    """The first "<Name> <legal form>" company mention in `text` (without the legal form), or ''."""
+    text = text or ''
+    suffix = _COMPANY_SUFFIX_RE.search(text)
+    if not suffix:
+        return ''
+    match = _COMPANY_RE.search(text, max(0, suffix.start() - _COMPANY_LOOKBACK))
+    if not match:
+        return ''
+    words = match.group(1).split()
+    while len(words) > 1 and words[0] in _LEADING_ARTICLES:
+        words = words[1:]
+    return ' '.join(words)
+
+
+def extract_entities(text: str) -> Dict:
+    """Amount (as written and in USD) and company of an article."""
+    amount = find_amount(text)
+    return {
+        'amount': amount.text if amount else '',
+        'amount_usd': amount.usd if amount else None,
+        'company': find_company(text),
+    }
+
+
+def _reference_amount_and_company(text: str) -> Tuple[str, str]:
+    """Original inline findall() extraction from extract_fdi_details, kept for the micro-benchmark."""
+    amount_pattern = r'(?:US\$|\$|USD\s?)?[\d,.]+\s?(?:million|billion|m|bn|b)?'
+    amounts = re.findall(amount_pattern, text, flags=re.IGNORECASE)
+
+    company_pattern = r'([A-Z][A-Za-z0-9&\- ]{2,})(?:\s+(?:Corp|Corporation|S\.A\.|SA|Inc|LLC|Group|Holdings|S\.A\. de C\.V\.))'
+    companies = [match.strip() for match in re.findall(company_pattern, text)]
+    return (amounts[0] if amounts else '', companies[0] if companies else '')
@@ -1,7 +1,107 @@
-import pandas as pd
+import csv
+import io
 from datetime import datetime
 import os
 
+import xlsxwriter
+
+COLUMNS = [
+    'Title', 'Summary', 'Source URL', 'Source', 'Published Date', 'Collected At',
+    'Countries', 'Sectors', 'Investment Amount', 'Investment (USD)', 'Company', 'Relevance Score', 'Origin'
+]
+
+MAX_COLUMN_WIDTH = 100
+PARQUET_BATCH_ROWS = 1000
+CSV_CHUNK_CHARS = 64 * 1024
+
+
+def _export_row(item):
+    """
+    Flatten a news item into the export columns, in COLUMNS order
+    """
+    return [
+        item.get('title', ''),
+        item.get('summary', ''),
+        item.get('url', ''),
+        item.get('source', ''),
+        item.get('published', ''),
+        item.get('collected_at', ''),
+        ', '.join(item.get('countries', []) or ([item.get('country')] if item.get('country') else [])),
+        ', '.join(item.get('sectors', []) or ([item.get('sector')] if item.get('sector') else [])),
+        item.get('amount', ''),
+        '' if item.get('amount_usd') is None else item['amount_usd'],
+        item.get('company', ''),
+        item.get('relevance_score', ''),
+        item.get('origin', '')
+    ]
+
+
+def write_excel(news_items, target):
+    """
+    Stream news items into an .xlsx workbook at `target` (a path or binary file object).
+
+    Rows are flushed to disk as they are written (constant memory), and column
+    widths are tracked while writing instead of re-reading every cell afterwards.
+    """
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True, 'strings_to_urls': False, 'strings_to_formulas': False})
+    worksheet = workbook.add_worksheet('FDI Projects')
+    header_format = workbook.add_format({'bold': True, 'border': 1})
+
+    widths = [len(column) for column in COLUMNS]
+    worksheet.write_row(0, 0, COLUMNS, header_format)
+    for row_number, item in enumerate(news_items, start=1):
+        row = _export_row(item)
+        worksheet.write_row(row_number, 0, row)
+        for index, value in enumerate(row):
+            length = len(str(value))
+            if length > widths[index]:
+                widths[index] = length
+
+    # Auto-adjust column widths
+    for index, width in enumerate(widths):
+        worksheet.set_column(index, index, min(width + 2, MAX_COLUMN_WIDTH))
+
+    workbook.close()
+
+
+def iter_csv(news_items):
+    """
+    Yield the export as CSV text in chunks of roughly CSV_CHUNK_CHARS
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for item in news_items:
+        writer.writerow(_export_row(item))
+        if buffer.tell() >= CSV_CHUNK_CHARS:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def write_parquet(news_items, target):
+    """
+    Write news items to a Parquet file in row groups (requires pyarrow)
+    """
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError('Parquet export requires the pyarrow package') from exc
+
+    schema = pa.schema([(column, pa.string()) for column in COLUMNS])
+    with pq.ParquetWriter(target, schema) as writer:
+        batch = []
+        for item in news_items:
+            batch.append(['' if value is None else str(value) for value in _export_row(item)])
+            if len(batch) >= PARQUET_BATCH_ROWS:
+                writer.write_table(pa.Table.from_pylist([dict(zip(COLUMNS, row)) for row in batch], schema=schema))
+                batch = []
+        if batch:
+            writer.write_table(pa.Table.from_pylist([dict(zip(COLUMNS, row)) for row in batch], schema=schema))
+
+
 def export_to_excel(news_items, filename=None):
     """
     Export news items to Excel file
@@ -9,48 +109,6 @@ def export_to_excel(news_items, filename=None):
     if not filename:
         os.makedirs('data', exist_ok=True)
         filename = f"data/fdi_projects_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
-    
-    # Prepare data for Excel
-    data = []
-    for item in news_items:
-        data.append({
-            'Title': item.get('title', ''),
-            'Summary': item.get('summary', ''),
-            'Source URL': item.get('url', ''),
-            'Source': item.get('source', ''),
-            'Published Date': item.get('published', ''),
-            'Collected At': item.get('collected_at', ''),
-            'Countries': ', '.join(item.get('countries', []) or ([item.get('country')] if item.get('country') else [])),
-            'Sectors': ', '.join(item.get('sectors', []) or ([item.get('sector')] if item.get('sector') else [])),
-            'Investment Amount': item.get('amount', ''),
-            'Company': item.get('company', ''),
-            'Relevance Score': item.get('relevance_score', ''),
-            'Origin': item.get('origin', '')
-        })
-    
-    # Create DataFrame
-    df = pd.DataFrame(data)
-    
-    # Export to Excel with formatting
-    with pd.ExcelWriter(filename, engine='openpyxl') as writer:
-        df.to_excel(writer, sheet_name='FDI Projects', index=False)
-        
-        # Get workbook and worksheet
-        workbook = writer.book
-        worksheet = writer.sheets['FDI Projects']
-        
-        # Auto-adjust column widths
-        for column in worksheet.columns:
-            max_length = 0
-            column_letter = column[0].column_letter
-            for cell in column:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 100)
-            worksheet.column_dimensions[column_letter].width = adjusted_width
-    
-    return filename
 
+    write_excel(news_items, filename)
+    return filename
@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import feedparser
+import requests
+
+from cache import CACHE_PATH, PersistentCache
+
+GOOGLE_NEWS_RSS = os.environ.get('FDI_NEWS_RSS_BASE', 'https://news.google.com/rss/search')
+FEED_CACHE_MAX_ENTRIES = int(os.environ.get('FDI_FEED_CACHE_MAX_ENTRIES', '500'))
+# Connect/read timeout of one feed request, so a stalled feed can't hold a thread forever
+FEED_TIMEOUT = float(os.environ.get('FDI_FEED_TIMEOUT', '8'))
+FEED_USER_AGENT = 'Mozilla/5.0 (compatible; FDI-Tracker/1.0)'
+
+# Links remembered per feed and consumer to tell new entries from ones already handed out
+MAX_SEEN_LINKS = 2000
+
+FEED_CACHE = PersistentCache(CACHE_PATH, 'feeds', ttl=None, max_entries=FEED_CACHE_MAX_ENTRIES)
+
+
+@dataclass
+class FeedResult:
+    """Entries of one feed poll; `new_entries` are the ones no earlier poll by the same consumer returned."""
+
+    url: str
+    status: Optional[int]
+    entries: List[feedparser.FeedParserDict] = field(default_factory=list)
+    new_entries: List[feedparser.FeedParserDict] = field(default_factory=list)
+    from_cache: bool = False
+
+
+def _entry_to_dict(entry) -> Dict:
+    source = entry.get('source') or {}
+    published_parsed = entry.get('published_parsed')
+    return {
+        'link': entry.get('link', ''),
+        'title': entry.get('title', ''),
+        'summary': entry.get('summary', ''),
+        'published': entry.get('published', ''),
+        'published_parsed': list(published_parsed[:9]) if published_parsed else None,
+        'source': {'title': source.get('title', '')} if source.get('title') else {},
+    }
+
+
+def _entry_from_dict(data: Dict) -> feedparser.FeedParserDict:
+    # Leave out empty optional fields so hasattr()/get() defaults behave as on a live parse
+    entry = feedparser.FeedParserDict({key: value for key, value in data.items() if value not in (None, {})})
+    if 'published_parsed' in entry:
+        entry['published_parsed'] = tuple(entry['published_parsed'])
+    return entry
+
+
+def _conditional_get(url: str, cached: Dict, timeout: float) -> Optional[requests.Response]:
+    """GET `url` with the cached validators; None when the request fails."""
+    headers = {'User-Agent': FEED_USER_AGENT}
+    if cached.get('etag'):
+        headers['If-None-Match'] = cached['etag']
+    if cached.get('modified'):
+        headers['If-Modified-Since'] = cached['modified']
+    try:
+        return requests.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException as exc:
+        print(f"Error fetching feed {url}: {exc}")
+        return None
+
+
+def fetch_feed(url: str, timeout: float = FEED_TIMEOUT, consumer: Optional[str] = None) -> FeedResult:
+    """
+    Poll a feed with a conditional GET, reusing the cached parse when unchanged.
+
+    ETag/Last-Modified validators and the parsed entries are kept per feed URL
+    in the shared SQLite cache. A 304 (or a failed fetch) serves the cached
+    entries; otherwise the fresh parse replaces them. The request gives up
+    after `timeout` seconds without a response.
+
+    Links handed out are remembered per `consumer`, so one caller polling the
+    feed doesn't hide entries from another; without a consumer nothing is
+    recorded and `new_entries` is empty.
+    """
+    cached = FEED_CACHE.get(url) or {}
+    response = _conditional_get(url, cached, timeout)
+    status = response.status_code if response is not None else None
+    parsed = None
+    if response is not None and response.ok and status != 304:
+        parsed = feedparser.parse(response.content, response_headers=dict(response.headers))
+
+    if parsed is None or (cached and not parsed.entries):
+        entries = cached.get('entries', [])
+        etag, modified = cached.get('etag'), cached.get('modified')
+        from_cache = True
+    else:
+        entries = [_entry_to_dict(entry) for entry in parsed.entries]
+        etag, modified = response.headers.get('ETag'), response.headers.get('Last-Modified')
+        from_cache = False
+
+    seen_by_consumer = cached.get('seen', {})
+    new_entries = []
+    if consumer is not None:
+        seen = dict.fromkeys(seen_by_consumer.get(consumer, []))
+        new_entries = [entry for entry in entries if entry['link'] and entry['link'] not in seen]
+        seen.update(dict.fromkeys(entry['link'] for entry in new_entries))
+        seen_by_consumer = {**seen_by_consumer, consumer: list(seen)[-MAX_SEEN_LINKS:]}
+
+    if not from_cache or new_entries:
+        FEED_CACHE.set(url, {
+            'etag': etag,
+            'modified': modified,
+            'entries': entries,
+            'seen': seen_by_consumer,
+        })
+
+    return FeedResult(
+        url=url,
+        status=status,
+        entries=[_entry_from_dict(entry) for entry in entries],
+        new_entries=[_entry_from_dict(entry) for entry in new_entries],
+        from_cache=from_cache,
+    )
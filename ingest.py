@@ -0,0 +1,130 @@
+"""
+Scheduled ingestion daemon.
+
+Polls the Google News feeds, scrapes and summarizes only entries published after
+the last run's high-water mark, and merges them into the shared news store so the
+web tier can serve precomputed results. Run alongside the web app:
+
+    python ingest.py              # poll forever every FDI_INGEST_INTERVAL seconds
+    python ingest.py --once       # single pass, e.g. from cron
+"""
+from __future__ import annotations
+
+import argparse
+import calendar
+import os
+import time
+from typing import Dict, List, Optional
+
+from app import _merge_news_items, _prepare_news_items
+from cache import CACHE_PATH, PersistentCache
+from feeds import _entry_from_dict, _entry_to_dict, fetch_feed
+from news_scraper import DATE_FEED_QUERY, LATEST_FEED_QUERY, google_news_feed_url, scrape_feed_entries
+
+INGEST_INTERVAL = float(os.environ.get('FDI_INGEST_INTERVAL', '900'))
+# Passes an entry whose download keeps failing is retried in before it is dropped
+INGEST_MAX_ATTEMPTS = int(os.environ.get('FDI_INGEST_MAX_ATTEMPTS', '5'))
+INGEST_FEEDS = [
+    google_news_feed_url(LATEST_FEED_QUERY, when='10d'),
+    google_news_feed_url(DATE_FEED_QUERY),
+]
+
+# Per-feed high-water marks (latest publish time processed, epoch seconds) and the
+# entries still to retry
+INGEST_STATE = PersistentCache(CACHE_PATH, 'ingest_state', ttl=None, max_entries=1000)
+# Name the feed cache remembers handed-out links under, apart from interactive searches
+INGEST_CONSUMER = 'ingest'
+
+
+def _published_at(entry) -> Optional[int]:
+    published_parsed = entry.get('published_parsed')
+    return calendar.timegm(tuple(published_parsed)[:9]) if published_parsed else None
+
+
+def ingest_feed(feed_url: str) -> List[Dict]:
+    """
+    Process the entries of one feed newer than its high-water mark, plus earlier
+    entries whose download failed; returns the new items.
+
+    The batch is checkpointed as pending before scraping, so a crash retries it.
+    Afterwards only the entries that failed again stay pending, each for at
+    most INGEST_MAX_ATTEMPTS passes.
+    """
+    state = INGEST_STATE.get(feed_url) or {}
+    high_water_mark = state.get('published_at')
+    retry = state.get('retry', {})
+    feed = fetch_feed(feed_url, consumer=INGEST_CONSUMER)
+    unseen_links = {entry.link for entry in feed.new_entries}
+
+    entries = {}
+    latest = high_water_mark
+    for entry in feed.entries:
+        published_at = _published_at(entry)
+        if published_at is None:
+            # Undated entries can't be compared to the mark; fall back to "not polled by us before"
+            if entry.link in unseen_links:
+                entries.setdefault(entry.link, entry)
+            continue
+        if high_water_mark is None or published_at > high_water_mark:
+            entries.setdefault(entry.link, entry)
+            latest = published_at if latest is None else max(latest, published_at)
+    for link, pending in retry.items():
+        entries.setdefault(link, _entry_from_dict(pending['entry']))
+
+    pending = {
+        link: {'entry': _entry_to_dict(entry), 'attempts': retry.get(link, {}).get('attempts', 0)}
+        for link, entry in entries.items()
+    }
+    if entries:
+        INGEST_STATE.set(feed_url, {'published_at': high_water_mark, 'retry': pending})
+
+    failed: List[str] = []
+    news_items = scrape_feed_entries(entries, failed=failed) if entries else []
+    news_items.sort(key=lambda x: x.get('relevance_score', 0), reverse=True)
+    fresh_items = _merge_news_items(_prepare_news_items(news_items)) if news_items else []
+
+    retry = {}
+    for link in failed:
+        attempts = pending[link]['attempts'] + 1
+        if attempts >= INGEST_MAX_ATTEMPTS:
+            print(f"Giving up on {link} after {attempts} failed downloads")
+            continue
+        retry[link] = {'entry': pending[link]['entry'], 'attempts': attempts}
+    if entries or latest != high_water_mark:
+        INGEST_STATE.set(feed_url, {'published_at': latest, 'retry': retry})
+    print(f"Ingested {feed_url}: {len(entries)} entries, {len(news_items)} relevant, {len(fresh_items)} stored, "
+          f"{len(retry)} to retry")
+    return fresh_items
+
+
+def ingest_once() -> int:
+    """Run one pass over every feed and return how many new items were stored."""
+    stored = 0
+    for feed_url in INGEST_FEEDS:
+        try:
+            stored += len(ingest_feed(feed_url))
+        except Exception as exc:
+            print(f"Error ingesting {feed_url}: {exc}")
+    return stored
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Poll FDI news feeds into the shared news store.')
+    parser.add_argument('--once', action='store_true', help='run a single ingestion pass and exit')
+    parser.add_argument('--interval', type=float, default=INGEST_INTERVAL, help='seconds between passes')
+    args = parser.parse_args()
+
+    while True:
+        started = time.monotonic()
+        stored = ingest_once()
+        print(f"Ingestion pass stored {stored} new items in {time.monotonic() - started:.1f}s")
+        if args.once:
+            break
+        time.sleep(max(0.0, args.interval - (time.monotonic() - started)))
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
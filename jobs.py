@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import os
+import threading
+import traceback
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+from metrics import TimingBreakdown, collect_timings
+
+JOB_WORKERS = int(os.environ.get('FDI_JOB_WORKERS', '2'))
+MAX_TRACKED_JOBS = int(os.environ.get('FDI_MAX_TRACKED_JOBS', '200'))
+
+
+class Job:
+    """A unit of background scraping/summarizing work and the items it produced so far."""
+
+    def __init__(self, kind: str):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.status = 'queued'
+        self.stage = 'queued'
+        self.total: Optional[int] = None
+        self.error: Optional[str] = None
+        # Set when a deadline cut the work short; lists the stages that stopped early
+        self.partial = False
+        self.cut_stages: List[str] = []
+        self.created_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        self.finished_at: Optional[str] = None
+        self.timings = TimingBreakdown()
+        self._items: List = []
+        self._lock = threading.Lock()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ('done', 'failed')
+
+    def update(self, **fields) -> None:
+        with self._lock:
+            for key, value in fields.items():
+                setattr(self, key, value)
+
+    def add_items(self, items: List) -> None:
+        """Append produced items; they must provide to_dict() (e.g. NewsRecord)."""
+        with self._lock:
+            self._items.extend(items)
+
+    def snapshot(self, since: int = 0, include_timings: bool = False) -> Dict:
+        """Serialize the job, including only items produced after index `since`."""
+        with self._lock:
+            since = max(0, since)
+            extra = {'timings': self.timings.to_dict()} if include_timings else {}
+            return {
+                'id': self.id,
+                'kind': self.kind,
+                'status': self.status,
+                'stage': self.stage,
+                'total': self.total,
+                'completed': len(self._items),
+                'error': self.error,
+                'partial': self.partial,
+                'cut_stages': list(self.cut_stages),
+                'created_at': self.created_at,
+                'finished_at': self.finished_at,
+                'news': [item.to_dict() for item in self._items[since:]],
+                'next': len(self._items),
+                **extra
+            }
+
+
+class JobQueue:
+    """Run jobs on a small thread pool and keep the most recent ones for polling."""
+
+    def __init__(self, max_workers: int = JOB_WORKERS, max_jobs: int = MAX_TRACKED_JOBS):
+        self.max_jobs = max_jobs
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='fdi-job')
+        self._jobs: 'OrderedDict[str, Job]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, func: Callable[..., None], *args) -> Job:
+        """Queue `func(job, *args)`; the function reports progress through the job."""
+        job = Job(kind)
+        with self._lock:
+            self._jobs[job.id] = job
+            self._prune()
+        self._executor.submit(self._run, job, func, args)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self) -> None:
+        # Drop the oldest finished jobs once we track more than max_jobs
+        overflow = len(self._jobs) - self.max_jobs
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished][:max(0, overflow)]:
+            del self._jobs[job_id]
+
+    def _run(self, job: Job, func: Callable[..., None], args) -> None:
+        job.update(status='running')
+        try:
+            with collect_timings(job.timings):
+                func(job, *args)
+        except Exception as exc:
+            traceback.print_exc()
+            job.update(status='failed', stage='failed', error=str(exc))
+        else:
+            job.update(status='done', stage='done')
+        finally:
+            job.update(finished_at=datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
@@ -0,0 +1,229 @@
+"""
+In-process pipeline metrics with Prometheus text exposition.
+
+Counters and histograms are module-level objects updated from the scraper,
+summarizer and web app; `render()` produces the /metrics payload. `timed()`
+records a stage both in the `fdi_stage_seconds` histogram and, when a
+`collect_timings()` block is active in the current context, in that
+per-request/per-job breakdown.
+"""
+from __future__ import annotations
+
+import contextvars
+import math
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+_REGISTRY: List = []
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, optionally split by labels."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            return self._values.get(key, 0)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram of observed values (seconds unless noted)."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        self._series: Dict[LabelValues, List] = {}
+        self._lock = threading.Lock()
+        _REGISTRY.append(self)
+
+    def observe(self, value: float, count: int = 1, **labels) -> None:
+        """Record `value` `count` times (e.g. the same per-chunk latency for every chunk of a batch)."""
+        key = tuple(str(labels.get(name, '')) for name in self.labelnames)
+        with self._lock:
+            series = self._series.setdefault(key, [[0] * len(self.buckets), 0.0, 0])
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[0][index] += count
+                    break
+            series[1] += value * count
+            series[2] += count
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, (bucket_counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, bucket_counts):
+                    cumulative += bucket_count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f'{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}')
+                labels = _format_labels(self.labelnames, key)
+                lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+                lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+class Gauge:
+    """Gauge read from a callback at scrape time; returns {label value tuple: value}."""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str],
+                 collect: Callable[[], Dict[LabelValues, float]]):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.collect = collect
+        _REGISTRY.append(self)
+
+    def render(self) -> List[str]:
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} gauge']
+        for key, value in sorted(self.collect().items()):
+            lines.append(f'{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}')
+        return lines
+
+
+def render() -> str:
+    """Every registered metric in the Prometheus text format (version 0.0.4)."""
+    lines = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+STAGE_SECONDS = Histogram('fdi_stage_seconds', 'Time spent in each pipeline stage.', ['stage'])
+HTTP_REQUEST_SECONDS = Histogram(
+    'fdi_http_request_seconds', 'Web request latency.', ['method', 'endpoint', 'status']
+)
+ARTICLES_FETCHED = Counter('fdi_articles_fetched_total', 'Articles downloaded and parsed (or served from cache).')
+FETCH_FAILURES = Counter('fdi_article_fetch_failures_total', 'Article downloads or parses that failed.')
+FETCH_SKIPPED = Counter(
+    'fdi_article_fetch_skipped_total', 'Article downloads not attempted (host circuit open, deadline).', ['reason']
+)
+ARTICLES_REJECTED = Counter(
+    'fdi_articles_rejected_total', 'Candidates dropped as not FDI/LatAm related.', ['stage']
+)
+SUMMARY_CACHE_REQUESTS = Counter(
+    'fdi_summary_cache_requests_total', 'AI summary cache lookups.', ['result']
+)
+SUMMARY_INFERENCE_SECONDS = Histogram(
+    'fdi_summary_inference_seconds_per_chunk', 'Model inference time per text chunk.', ['backend'],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0),
+)
+
+
+class TimingBreakdown:
+    """Seconds and call counts per stage for one request or job."""
+
+    def __init__(self):
+        self._stages: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+        self.started = time.perf_counter()
+        self.stopped: Optional[float] = None
+
+    def stop(self) -> None:
+        self.stopped = time.perf_counter()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            entry = self._stages.setdefault(stage, [0.0, 0])
+            entry[0] += seconds
+            entry[1] += 1
+
+    def to_dict(self) -> Dict:
+        """Stage seconds are summed across worker threads, so they can exceed the wall time."""
+        with self._lock:
+            return {
+                'total_seconds': round((self.stopped or time.perf_counter()) - self.started, 4),
+                'stages': {
+                    stage: {'seconds': round(seconds, 4), 'count': count}
+                    for stage, (seconds, count) in self._stages.items()
+                },
+            }
+
+
+_ACTIVE_TIMINGS: contextvars.ContextVar[Optional[TimingBreakdown]] = contextvars.ContextVar(
+    'fdi_active_timings', default=None
+)
+
+
+def activate_timings(breakdown: TimingBreakdown) -> contextvars.Token:
+    """Send timed() stages run in this context (and contexts copied from it) to `breakdown`."""
+    return _ACTIVE_TIMINGS.set(breakdown)
+
+
+def deactivate_timings(token: contextvars.Token) -> None:
+    _ACTIVE_TIMINGS.reset(token)
+
+
+@contextmanager
+def collect_timings(breakdown: Optional[TimingBreakdown] = None) -> Iterator[TimingBreakdown]:
+    """Time the block into `breakdown` (a fresh one by default), including its total wall time."""
+    breakdown = breakdown or TimingBreakdown()
+    breakdown.started = time.perf_counter()
+    token = activate_timings(breakdown)
+    try:
+        yield breakdown
+    finally:
+        deactivate_timings(token)
+        breakdown.stop()
+
+
+def record_stage(stage: str, seconds: float) -> None:
+    STAGE_SECONDS.observe(seconds, stage=stage)
+    breakdown = _ACTIVE_TIMINGS.get()
+    if breakdown is not None:
+        breakdown.add(stage, seconds)
+
+
+@contextmanager
+def timed(stage: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(stage, time.perf_counter() - started)
@@ -1,13 +1,31 @@
 from __future__ import annotations
 
+import contextvars
+import os
 import re
+import threading
 import time
-from datetime import datetime
-from typing import Dict, List
-
-import feedparser
-from googlesearch import search
-from newspaper import Article
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import date, datetime, timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import requests
+
+from cache import CACHE_PATH, ParsedArticle, PersistentCache, download_article, get_article
+from deadlines import Deadline
+from entities import extract_entities
+from feeds import GOOGLE_NEWS_RSS
+from metrics import ARTICLES_FETCHED, ARTICLES_REJECTED, FETCH_FAILURES, FETCH_SKIPPED, record_stage, timed
+from sources import Candidate, FeedSource, Source, WebSearchSource, gather_candidates
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
 
 LATAM_COUNTRIES = [
     'Argentina', 'Bolivia', 'Brazil', 'Chile', 'Colombia', 'Costa Rica', 'Cuba',
@@ -41,12 +59,178 @@ EXCLUDE_KEYWORDS = [
 
 MIN_RELEVANCE_SCORE = 6
 
+# Concurrency for article downloads and the minimum spacing between two
+# requests to the same host (replaces the old global time.sleep(0.5)).
+FETCH_WORKERS = int(os.environ.get('FDI_FETCH_WORKERS', '8'))
+PER_HOST_DELAY = float(os.environ.get('FDI_PER_HOST_DELAY', '0.5'))
+
+# Article download timeout, overridable per host ("ft.com=4,bloomberg.com=5");
+# a host entry also covers its subdomains
+ARTICLE_TIMEOUT = float(os.environ.get('FDI_ARTICLE_TIMEOUT', '10'))
+HOST_TIMEOUTS = {
+    host.strip().lower(): float(seconds)
+    for host, _, seconds in (
+        pair.partition('=') for pair in os.environ.get('FDI_HOST_TIMEOUTS', '').split(',') if '=' in pair
+    )
+}
+# Hosts whose article links only redirect to the publisher (every Google News item is a
+# news.google.com link). Their redirects are resolved first, so timeouts, rate limits and
+# the circuit breaker apply to the publisher's host rather than to the aggregator's.
+AGGREGATOR_HOSTS = frozenset(
+    host.strip().lower() for host in os.environ.get('FDI_AGGREGATOR_HOSTS', 'news.google.com').split(',')
+    if host.strip()
+)
+MAX_REDIRECTS = 5
+# Consecutive failed downloads before a host is skipped, and for how long
+HOST_FAILURE_THRESHOLD = int(os.environ.get('FDI_HOST_FAILURE_THRESHOLD', '3'))
+HOST_COOLDOWN = float(os.environ.get('FDI_HOST_COOLDOWN', '600'))
+
+# Feed entries whose title+summary score falls below this are never downloaded;
+# entries scoring under MIN_RELEVANCE_SCORE are only fetched after the strong ones.
+PREFILTER_MIN_SCORE = int(os.environ.get('FDI_PREFILTER_MIN_SCORE', '2'))
+
 
 def clean_text(value: str) -> str:
     return ' '.join(value.split()) if value else ''
 
 
+def _trie_pattern(keywords: Iterable[str]) -> str:
+    """
+    One regex alternation of `keywords`, factored into a trie.
+
+    Shared prefixes are matched once, so at each text position the engine
+    follows a single branch per character instead of trying every keyword;
+    optional tails are greedy, so the longest keyword starting there wins.
+    """
+    trie: Dict = {}
+    for keyword in keywords:
+        node = trie
+        for char in keyword:
+            node = node.setdefault(char, {})
+        node[''] = {}
+
+    def build(node: Dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ''
+        body = branches[0] if len(branches) == 1 else '(?:' + '|'.join(branches) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """
+    Find the keywords of several groups in a text with one scan.
+
+    Every keyword goes into a single Aho-Corasick automaton (pyahocorasick)
+    or, without it, a single trie-shaped regex alternation, searched once over
+    the lowercased text. Matching keeps the substring semantics of the
+    original per-list `in` checks ('develop' matches 'development'). The
+    automaton reports overlapping matches itself; the regex only reports
+    non-overlapping ones, so each regex match also accounts for the keywords
+    inside it and checks the ones that start inside it and run past its end
+    ('investment' in 'foreign direct investment').
+    """
+
+    def __init__(self, groups: Dict[str, Dict[str, Iterable[str]]], automaton: Optional[bool] = None):
+        # groups: group name -> {label: keywords}; a match reports the label
+        self._groups = tuple(groups)
+        self._targets: Dict[str, List[Tuple[str, str]]] = {}
+        for group, labels in groups.items():
+            for label, keywords in labels.items():
+                for keyword in keywords:
+                    self._targets.setdefault(keyword.lower(), []).append((group, label))
+        keywords = list(self._targets)
+
+        self._automaton = None
+        use_automaton = ahocorasick is not None if automaton is None else automaton
+        if use_automaton:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in keywords:
+                self._automaton.add_word(keyword, (keyword, len(keyword) - 1))
+            self._automaton.make_automaton()
+            return
+
+        self._pattern = re.compile(_trie_pattern(keywords))
+        # keyword -> (other keyword, offset) for every occurrence of another keyword inside it
+        self._inside = {
+            keyword: [(other, offset) for other in keywords if other != keyword
+                      for offset in range(len(keyword) - len(other) + 1) if keyword.startswith(other, offset)]
+            for keyword in keywords
+        }
+        # keyword -> (other keyword, offset) for keywords that could start inside it and end after it
+        self._overlaps = {
+            keyword: [(other, offset) for offset in range(1, len(keyword)) for other in keywords
+                      if len(other) > len(keyword) - offset and other.startswith(keyword[offset:])]
+            for keyword in keywords
+        }
+
+    def scan(self, text: str) -> Dict[str, int]:
+        """Every keyword found in `text`, mapped to the position of its last occurrence."""
+        lowered = (text or '').lower()
+        if self._automaton is not None:
+            # Matches come in end order, so the last one seen for a keyword is its last occurrence
+            return {keyword: end - length for end, (keyword, length) in self._automaton.iter(lowered)}
+
+        found: Dict[str, int] = {}
+        for match in self._pattern.finditer(lowered):
+            keyword, start = match.group(), match.start()
+            found[keyword] = start
+            for other, offset in self._inside[keyword]:
+                found[other] = max(found.get(other, -1), start + offset)
+            for other, offset in self._overlaps[keyword]:
+                if lowered.startswith(other, start + offset):
+                    found[other] = max(found.get(other, -1), start + offset)
+        return found
+
+    def labels(self, found: Dict[str, int], groups: Optional[Iterable[str]] = None,
+               start: int = 0) -> Dict[str, List[str]]:
+        """Labels per requested group (default: all) of the scanned keywords occurring at or after `start`."""
+        groups = tuple(groups) if groups is not None else self._groups
+        labels: Dict[str, List[str]] = {group: [] for group in groups}
+        for keyword, position in found.items():
+            if position >= start:
+                for group, label in self._targets[keyword]:
+                    if group in labels:
+                        labels[group].append(label)
+        # Several keywords can share a label (sectors); keep the first occurrence
+        return {group: list(dict.fromkeys(values)) for group, values in labels.items()}
+
+    def match(self, text: str, groups: Optional[Iterable[str]] = None) -> Dict[str, List[str]]:
+        """Return the labels found in `text` for each requested group (default: all)."""
+        return self.labels(self.scan(text), groups)
+
+
+def _keyword_labels(keywords: List[str]) -> Dict[str, List[str]]:
+    return {keyword: [keyword] for keyword in keywords}
+
+
+KEYWORD_GROUPS = {
+    'core': _keyword_labels(FDI_CORE_KEYWORDS),
+    'deal': _keyword_labels(DEAL_TERMS),
+    'countries': _keyword_labels(LATAM_COUNTRIES),
+    'exclude': _keyword_labels(EXCLUDE_KEYWORDS),
+    'sectors': SECTOR_KEYWORDS,
+}
+KEYWORD_MATCHER = KeywordMatcher(KEYWORD_GROUPS)
+_RELEVANCE_GROUPS = ('core', 'deal', 'countries', 'exclude')
+_DETAIL_GROUPS = ('countries', 'sectors')
+
+
+def _score_matches(matches: Dict[str, List[str]]) -> int:
+    score = 3 * len(matches['core']) + 2 * len(matches['deal']) + 2 * len(matches['countries'])
+    if matches['exclude']:
+        score -= 4
+    return score
+
+
 def score_article_relevance(title: str, summary: str, text: str) -> int:
+    return _score_matches(KEYWORD_MATCHER.match(f"{title} {summary} {text}", _RELEVANCE_GROUPS))
+
+
+def _reference_score_article_relevance(title: str, summary: str, text: str) -> int:
+    """Original list-by-list scorer, kept to check KeywordMatcher against."""
     combined = f"{title} {summary} {text}".lower()
     score = 0
 
@@ -60,243 +244,611 @@ def score_article_relevance(title: str, summary: str, text: str) -> int:
     return score
 
 
-def is_fdi_latin_america_related(title: str, summary: str, text: str) -> bool:
-    return score_article_relevance(title, summary, text) >= MIN_RELEVANCE_SCORE
-
+def _reference_countries_and_sectors(text: str) -> Tuple[List[str], List[str]]:
+    """Original country/sector detection from extract_fdi_details, kept to check KeywordMatcher against."""
+    lower_text = (text or '').lower()
+    countries = [c for c in LATAM_COUNTRIES if c.lower() in lower_text]
+    sectors = [sector for sector, keywords in SECTOR_KEYWORDS.items()
+               if any(keyword in lower_text for keyword in keywords)]
+    return sorted(set(countries)), sorted(set(sectors))
 
-def extract_fdi_details(text: str) -> Dict[str, List[str]]:
-    text = text or ''
-    lower_text = text.lower()
 
-    countries = [c for c in LATAM_COUNTRIES if c.lower() in lower_text]
+def is_fdi_latin_america_related(title: str, summary: str, text: str) -> bool:
+    return score_article_relevance(title, summary, text) >= MIN_RELEVANCE_SCORE
 
-    sectors = []
-    for sector, keywords in SECTOR_KEYWORDS.items():
-        if any(keyword in lower_text for keyword in keywords):
-            sectors.append(sector)
 
-    amount_pattern = r'(?:US\$|\$|USD\s?)?[\d,.]+\s?(?:million|billion|m|bn|b)?'
-    amounts = re.findall(amount_pattern, text, flags=re.IGNORECASE)
+@dataclass(frozen=True)
+class ArticleMatches:
+    """Relevance score of an article and the countries/sectors its text names."""
+
+    relevance: int
+    countries: List[str]
+    sectors: List[str]
+
+    @property
+    def related(self) -> bool:
+        return self.relevance >= MIN_RELEVANCE_SCORE
+
+
+def match_article(title: str, summary: str, text: str) -> ArticleMatches:
+    """
+    Score `title`/`summary`/`text` and detect the countries and sectors of
+    `text` (of `summary` when there is no text) with a single keyword scan.
+
+    Same results as score_article_relevance(title, summary, text) and
+    extract_fdi_details(text or summary), without scanning the text twice.
+    """
+    head = f"{title} {summary} "
+    found = KEYWORD_MATCHER.scan(head + text)
+    # Keywords last seen at or after this position occur in the detail text
+    details_start = len(head) if text else len(title) + 1
+    details = KEYWORD_MATCHER.labels(found, _DETAIL_GROUPS, start=details_start)
+    return ArticleMatches(
+        relevance=_score_matches(KEYWORD_MATCHER.labels(found, _RELEVANCE_GROUPS)),
+        countries=sorted(set(details['countries'])),
+        sectors=sorted(set(details['sectors'])),
+    )
 
-    company_pattern = r'([A-Z][A-Za-z0-9&\- ]{2,})(?:\s+(?:Corp|Corporation|S\.A\.|SA|Inc|LLC|Group|Holdings|S\.A\. de C\.V\.))'
-    companies = [match.strip() for match in re.findall(company_pattern, text)]
 
+def extract_fdi_details(text: str) -> Dict:
+    text = text or ''
+    matches = KEYWORD_MATCHER.match(text, _DETAIL_GROUPS)
     return {
-        'countries': sorted(set(countries)),
-        'sectors': sorted(set(sectors)),
-        'amount': amounts[0] if amounts else '',
-        'company': companies[0] if companies else '',
+        'countries': sorted(set(matches['countries'])),
+        'sectors': sorted(set(matches['sectors'])),
+        **extract_entities(text),
     }
 
 
-def build_news_item(title: str, url: str, summary: str, published: str, source: str, text: str, origin: str = 'rss') -> Dict:
-    clean_summary = clean_text(summary)[:700]
+def build_news_item(title: str, url: str, summary: str, published: str, source: str, text: str, origin: str = 'rss',
+                    matches: Optional[ArticleMatches] = None) -> Dict:
+    """
+    The news item for a downloaded article. Pass the article's `matches` when
+    they are already known (from match_article over the same cleaned text) to
+    skip the keyword scan.
+
+    Items with article text get an empty summary, which _prepare_news_items
+    fills in with one batched summarization pass; without text the feed
+    `summary` is all there is and is kept.
+    """
+    clean_summary = clean_text(summary)
     clean_text_content = clean_text(text)
-    details = extract_fdi_details(clean_text_content or clean_summary)
-    relevance = score_article_relevance(title, summary, clean_text_content)
+    if matches is None:
+        matches = match_article(title, clean_summary, clean_text_content)
+    entities = extract_entities(clean_text_content or clean_summary[:700])
 
     return {
         'title': title,
         'url': url,
-        'summary': clean_summary,
+        'summary': '' if clean_text_content else clean_summary[:700],
         'published': published,
         'source': source,
         'content': clean_text_content,
-        'relevance_score': relevance,
-        'countries': details['countries'],
-        'country': details['countries'][0] if details['countries'] else '',
-        'sectors': details['sectors'],
-        'sector': details['sectors'][0] if details['sectors'] else '',
-        'amount': details['amount'],
-        'company': details['company'],
+        'relevance_score': matches.relevance,
+        'countries': matches.countries,
+        'country': matches.countries[0] if matches.countries else '',
+        'sectors': matches.sectors,
+        'sector': matches.sectors[0] if matches.sectors else '',
+        'amount': entities['amount'],
+        'amount_usd': entities['amount_usd'],
+        'company': entities['company'],
         'origin': origin,
     }
 
 
-def parse_article(url: str) -> Article:
-    article = Article(url)
-    article.download()
-    article.parse()
-    return article
+class HostUnavailable(Exception):
+    """The host's circuit breaker is open; the article wasn't requested."""
 
 
-def search_fdi_news(query: str = "FDI projects Latin America", num_results: int = 20):
-    news_items = []
-    urls_found = set()
+class DeadlineReached(Exception):
+    """The request deadline ran out before the article could be requested."""
 
-    search_query = (
-        "FDI foreign direct investment Latin America Argentina Brazil Chile Colombia "
-        "Mexico Peru AND project"
-    )
-    google_news_url = (
-        f"https://news.google.com/rss/search?q={search_query.replace(' ', '+')}+when:10d&hl=en&gl=US&ceid=US:en"
-    )
 
-    try:
-        feed = feedparser.parse(google_news_url)
-        for entry in feed.entries[:num_results * 3]:
-            if entry.link in urls_found:
-                continue
+def _host(url: str) -> str:
+    host = (urlparse(url).hostname or '').lower()
+    return host[4:] if host.startswith('www.') else host
 
-            entry_title = entry.title or ''
-            entry_summary = entry.get('summary', '') or ''
 
-            try:
-                article = parse_article(entry.link)
-                article_text = article.text or ''
-            except Exception:
-                article = None
-                article_text = ''
+def _host_timeout(host: str) -> float:
+    parts = host.split('.')
+    for index in range(len(parts)):
+        timeout = HOST_TIMEOUTS.get('.'.join(parts[index:]))
+        if timeout is not None:
+            return timeout
+    return ARTICLE_TIMEOUT
 
-            if not is_fdi_latin_america_related(entry_title, entry_summary, article_text):
-                continue
 
-            news_items.append(
-                build_news_item(
-                    title=entry_title,
-                    url=entry.link,
-                    summary=article_text[:600] if article_text else entry_summary,
-                    published=entry.get('published', ''),
-                    source=entry.get('source', {}).get('title', 'Google News'),
-                    text=article_text,
-                )
-            )
-            urls_found.add(entry.link)
-            if len(news_items) >= num_results:
-                break
-            time.sleep(0.5)
-    except Exception as exc:
-        print(f"Error fetching Google News: {exc}")
+# Aggregator link -> publisher URL; a link always redirects to the same article
+RESOLVED_URLS = PersistentCache(CACHE_PATH, 'resolved_urls', ttl=None, max_entries=20000)
 
-    if len(news_items) < num_results:
-        try:
-            fallback_query = (
-                "(FDI OR 'foreign direct investment') Latin America site:reuters.com OR site:bloomberg.com "
-                "OR site:bloomberglinea.com OR site:bnamericas.com"
-            )
-            for url in search(fallback_query, num=min(25, num_results * 3), stop=25):
-                if url in urls_found:
-                    continue
-
-                try:
-                    article = parse_article(url)
-                except Exception:
-                    continue
-
-                if not is_fdi_latin_america_related(article.title or '', article.text[:300], article.text):
-                    continue
-
-                news_items.append(
-                    build_news_item(
-                        title=article.title or 'No title',
-                        url=url,
-                        summary=article.text[:600],
-                        published=article.publish_date.strftime('%Y-%m-%d') if article.publish_date else '',
-                        source=url.split('/')[2] if '/' in url else 'Unknown',
-                        text=article.text,
-                        origin='web',
-                    )
-                )
-                urls_found.add(url)
-                if len(news_items) >= num_results:
-                    break
-                time.sleep(0.5)
-        except Exception as exc:
-            print(f"Error in web search: {exc}")
-
-    return news_items[:num_results]
-
-
-def search_fdi_news_by_date(search_date: str, num_results: int = 10):
-    news_items = []
-    urls_found = set()
 
-    try:
-        target_date = datetime.strptime(search_date, '%Y-%m-%d')
-    except ValueError:
-        return []
+def resolve_publisher_url(url: str, timeout: Optional[float] = None) -> str:
+    """
+    The publisher URL an aggregator link redirects to.
 
-    base_query = "FDI foreign direct investment Latin America"
-    query_encoded = base_query.replace(' ', '+')
-    google_news_url = f"https://news.google.com/rss/search?q={query_encoded}&hl=en&gl=US&ceid=US:en"
+    Redirects are followed one hop at a time and only while they stay on
+    aggregator hosts, so the publisher itself isn't contacted; each hop waits
+    for the aggregator's rate-limit slot. Direct links, and links that can't
+    be resolved, are returned unchanged.
+    """
+    if _host(url) not in AGGREGATOR_HOSTS:
+        return url
+    cached = RESOLVED_URLS.get(url)
+    if cached is not None:
+        return cached['url']
 
+    current = url
     try:
-        feed = feedparser.parse(google_news_url)
-        for entry in feed.entries[:num_results * 4]:
-            if entry.link in urls_found:
-                continue
+        for _ in range(MAX_REDIRECTS):
+            _HOST_LIMITER.wait(_host(current))
+            response = requests.head(current, allow_redirects=False, timeout=timeout)
+            location = response.headers.get('Location')
+            if not response.is_redirect or not location:
+                break
+            current = urljoin(current, location)
+            if _host(current) not in AGGREGATOR_HOSTS:
+                break
+    except requests.RequestException as exc:
+        # Not cached: the next attempt tries again
+        print(f"Could not resolve {url}: {exc}")
+        return url
+    RESOLVED_URLS.set(url, {'url': current})
+    return current
+
+
+class _HostCircuitBreaker:
+    """
+    Skip hosts whose downloads keep failing (errors and timeouts alike).
+
+    After `threshold` consecutive failures a host is skipped for `cooldown`
+    seconds; the first download after that is a trial, and one more failure
+    opens the circuit again straight away.
+    """
+
+    def __init__(self, threshold: int, cooldown: float):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._failures: Dict[str, int] = {}
+        self._open_until: Dict[str, float] = {}
+
+    def allow(self, host: str) -> bool:
+        with self._lock:
+            return self._open_until.get(host, 0.0) <= time.monotonic()
+
+    def record(self, host: str, ok: bool) -> None:
+        with self._lock:
+            if ok:
+                self._failures.pop(host, None)
+                self._open_until.pop(host, None)
+                return
+            failures = self._failures.get(host, 0) + 1
+            self._failures[host] = failures
+            now = time.monotonic()
+            already_open = self._open_until.get(host, 0.0) > now
+            if failures >= self.threshold:
+                self._open_until[host] = now + self.cooldown
+            if failures >= self.threshold and not already_open:
+                print(f"Skipping {host} for {self.cooldown:.0f}s after {failures} failed downloads")
+
+    def open_hosts(self) -> List[str]:
+        now = time.monotonic()
+        with self._lock:
+            return sorted(host for host, until in self._open_until.items() if until > now)
+
+
+class _HostRateLimiter:
+    """Hand out request slots per host, spaced at least `delay` seconds apart."""
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self._lock = threading.Lock()
+        self._next_slot: Dict[str, float] = {}
+
+    def wait(self, host: str) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, 0.0))
+            self._next_slot[host] = slot + self.delay
+        pause = slot - time.monotonic()
+        if pause > 0:
+            time.sleep(pause)
+            record_stage('rate_limit_wait', pause)
+
+
+_HOST_LIMITER = _HostRateLimiter(PER_HOST_DELAY)
+HOST_BREAKER = _HostCircuitBreaker(HOST_FAILURE_THRESHOLD, HOST_COOLDOWN)
+
+
+def parse_article(url: str, deadline: Optional[Deadline] = None) -> ParsedArticle:
+    """
+    Return the parsed article, downloading it on a cache miss.
+
+    Aggregator links are first resolved to the publisher's URL. Downloads are
+    rate limited per publisher host and time out after the publisher host's timeout or
+    at the deadline, whichever is sooner. Raises HostUnavailable for hosts the
+    circuit breaker is skipping and DeadlineReached when no time is left.
+    """
+    deadline = deadline or Deadline()
+
+    def download(url: str) -> ParsedArticle:
+        # Cache hits skip all of this; only real downloads are resolved, gated and rate limited
+        publisher_url = resolve_publisher_url(url, deadline.timeout(ARTICLE_TIMEOUT))
+        host = _host(publisher_url)
+        # An unresolved aggregator link says nothing about any one publisher, so it is never skipped
+        counted = host not in AGGREGATOR_HOSTS
+        if counted and not HOST_BREAKER.allow(host):
+            raise HostUnavailable(host)
+        _HOST_LIMITER.wait(host)
+        if deadline.expired:
+            raise DeadlineReached(url)
+        try:
+            article = download_article(publisher_url, timeout=deadline.timeout(_host_timeout(host)))
+        except Exception:
+            # A download cut short by our own deadline says nothing about the host
+            if counted and not deadline.expired:
+                HOST_BREAKER.record(host, ok=False)
+            raise
+        if counted:
+            HOST_BREAKER.record(host, ok=True)
+        return replace(article, url=url)
 
-            entry_date_str = None
-            if hasattr(entry, 'published_parsed') and entry.published_parsed:
-                entry_date = datetime(*entry.published_parsed[:6])
-                entry_date_str = entry_date.strftime('%Y-%m-%d')
+    return get_article(url, download=download)
 
-            if entry_date_str and entry_date_str != search_date:
-                continue
 
-            try:
-                article = parse_article(entry.link)
-                article_text = article.text or ''
-            except Exception:
-                article = None
-                article_text = ''
+def _fetch_article(url: str, deadline: Deadline) -> Optional[ParsedArticle]:
+    try:
+        with timed('article_fetch'):
+            article = parse_article(url, deadline)
+    except HostUnavailable:
+        FETCH_SKIPPED.inc(reason='circuit_open')
+        return None
+    except DeadlineReached:
+        FETCH_SKIPPED.inc(reason='deadline')
+        deadline.cut('articles')
+        return None
+    except Exception:
+        FETCH_FAILURES.inc()
+        return None
+    ARTICLES_FETCHED.inc()
+    return article
 
-            if not is_fdi_latin_america_related(entry.title or '', entry.get('summary', ''), article_text):
-                continue
 
-            news_items.append(
-                build_news_item(
-                    title=entry.title,
-                    url=entry.link,
-                    summary=article_text[:600] if article_text else entry.get('summary', ''),
-                    published=entry.get('published', ''),
-                    source=entry.get('source', {}).get('title', 'Google News'),
-                    text=article_text,
-                )
+def iter_parsed_articles(urls: Iterable[str], max_workers: int = FETCH_WORKERS,
+                         deadline: Optional[Deadline] = None) -> Iterator[Tuple[str, Optional[ParsedArticle]]]:
+    """
+    Download and parse articles concurrently, yielding (url, article) in input order.
+
+    Only a bounded window of downloads is in flight at a time, so callers that
+    stop iterating early (enough results found) don't pay for the rest; pending
+    downloads are cancelled when the generator is closed. Failed or skipped
+    downloads yield None for the article. When `deadline` runs out, iteration
+    stops and downloads still in flight are abandoned.
+    """
+    deadline = deadline or Deadline()
+    url_iter = iter(urls)
+    window = max(1, max_workers) * 2
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    # Workers run in a copy of the caller's context so their stage timings reach its breakdown
+    context = contextvars.copy_context()
+    pending = deque(
+        (url, executor.submit(context.copy().run, _fetch_article, url, deadline)) for url in islice(url_iter, window)
+    )
+    try:
+        while pending:
+            url, future = pending.popleft()
+            try:
+                article = future.result(timeout=deadline.remaining())
+            except TimeoutError:
+                deadline.cut('articles')
+                print(f"Request deadline reached with {len(pending) + 1} downloads in flight")
+                return
+            next_url = next(url_iter, None)
+            if next_url is not None:
+                pending.append((next_url, executor.submit(context.copy().run, _fetch_article, next_url, deadline)))
+            yield url, article
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+_prefilter_lock = threading.Lock()
+prefilter_stats = {'candidates': 0, 'dropped': 0, 'downloaded': 0, 'saved': 0}
+
+
+def rank_candidates(candidates: List[Candidate]) -> Tuple[List[Candidate], int]:
+    """
+    Score candidates on their title/summary and order them for download, best first.
+
+    Feed candidates scoring below PREFILTER_MIN_SCORE are dropped before any
+    download; web hits (nothing to score until fetched) follow every feed
+    candidate. Ties keep source order. Returns the ranked candidates and how
+    many were dropped.
+    """
+    kept = []
+    for candidate in candidates:
+        if candidate.prefilter:
+            candidate.score = score_article_relevance(candidate.title, candidate.summary, '')
+            if candidate.score < PREFILTER_MIN_SCORE:
+                continue
+        kept.append(candidate)
+    kept.sort(key=lambda candidate: (candidate.prefilter, candidate.score), reverse=True)
+    return kept, len(candidates) - len(kept)
+
+
+def _record_prefilter(candidates: int, dropped: int, downloaded: int) -> None:
+    # Only prefilter drops count as saved downloads: candidates skipped by an
+    # early stop or the deadline, and web hits, were never ruled out by the prefilter
+    ARTICLES_REJECTED.inc(dropped, stage='prefilter')
+    with _prefilter_lock:
+        prefilter_stats['candidates'] += candidates
+        prefilter_stats['dropped'] += dropped
+        prefilter_stats['downloaded'] += downloaded
+        prefilter_stats['saved'] += dropped
+    print(f"Prefilter: {candidates} candidates, {dropped} dropped, {downloaded} fetched, {dropped} downloads saved")
+
+
+def google_news_feed_url(query: str, when: Optional[str] = None) -> str:
+    when_filter = f"+when:{when}" if when else ''
+    return f"{GOOGLE_NEWS_RSS}?q={query.replace(' ', '+')}{when_filter}&hl=en&gl=US&ceid=US:en"
+
+
+def _candidate_item(candidate: Candidate, article: Optional[ParsedArticle], default_published: str) -> Optional[Dict]:
+    """Build the news item for a downloaded candidate, or None when it isn't relevant."""
+    if candidate.origin == 'web':
+        if article is None:
+            return None
+        title, text = article.title or '', clean_text(article.text)
+        summary = text[:300]
+    else:
+        title, summary = candidate.title, clean_text(candidate.summary)
+        text = clean_text(article.text) if article else ''
+
+    # One keyword scan decides relevance and supplies the item's countries and sectors
+    with timed('relevance'):
+        matches = match_article(title, summary, text)
+    if not matches.related:
+        ARTICLES_REJECTED.inc(stage='relevance')
+        return None
+
+    with timed('build_item'):
+        if candidate.origin == 'web':
+            return build_news_item(
+                title=title or 'No title',
+                url=candidate.link,
+                summary=text[:600],
+                published=article.publish_date.strftime('%Y-%m-%d') if article.publish_date else default_published,
+                source=candidate.link.split('/')[2] if '/' in candidate.link else 'Unknown',
+                text=text,
+                origin='web',
+                matches=matches,
             )
-            news_items[-1]['date'] = search_date
-            urls_found.add(entry.link)
-            if len(news_items) >= num_results:
+        return build_news_item(
+            title=title,
+            url=candidate.link,
+            summary=text[:600] if text else summary,
+            published=candidate.published,
+            source=candidate.source or 'Google News',
+            text=text,
+            matches=matches,
+        )
+
+
+def scrape_candidates(candidates: List[Candidate], num_results: Optional[int] = None,
+                      default_published: str = '', deadline: Optional[Deadline] = None,
+                      failed: Optional[List[str]] = None) -> List[Dict]:
+    """
+    Turn a merged candidate stream into relevant news items.
+
+    Candidates are ranked by their pre-download relevance score, the survivors
+    are downloaded concurrently in rank order, and kept when the full text is
+    FDI/LatAm related. Stops once `num_results` items are found (no limit when
+    None) or when `deadline` runs out, returning what was found by then.
+    Links whose download failed or was skipped, or that the deadline left
+    unreached, are appended to `failed` when it is given.
+    """
+    news_items = []
+    ranked, dropped = rank_candidates(candidates)
+    by_link = {candidate.link: candidate for candidate in ranked}
+    links = list(by_link)
+    downloaded = 0
+    enough = False
+    articles = iter_parsed_articles(links, deadline=deadline)
+    try:
+        for link, article in articles:
+            downloaded += 1
+            if article is None and failed is not None:
+                failed.append(link)
+            item = _candidate_item(by_link[link], article, default_published)
+            if item is None:
+                continue
+            news_items.append(item)
+            if num_results is not None and len(news_items) >= num_results:
+                enough = True
                 break
-            time.sleep(0.5)
+    finally:
+        articles.close()
+        if failed is not None and not enough:
+            failed.extend(links[downloaded:])
+        _record_prefilter(len(candidates), dropped, downloaded)
+    return news_items
+
+
+def scrape_feed_entries(entries: Dict[str, Dict], num_results: Optional[int] = None,
+                        failed: Optional[List[str]] = None) -> List[Dict]:
+    """Scrape feed entries (keyed by link) into relevant news items; see scrape_candidates for `failed`."""
+    candidates = [Candidate.from_entry(entry) for entry in entries.values()]
+    return scrape_candidates(candidates, num_results, failed=failed)
+
+
+def scrape_web_results(urls: List[str], num_results: int, default_published: str = '') -> List[Dict]:
+    """Download web search hits and keep the relevant ones as news items."""
+    candidates = [Candidate(link=url, origin='web', prefilter=False) for url in urls]
+    return scrape_candidates(candidates, num_results, default_published=default_published)
+
+
+LATEST_FEED_QUERY = (
+    "FDI foreign direct investment Latin America Argentina Brazil Chile Colombia "
+    "Mexico Peru AND project"
+)
+DATE_FEED_QUERY = "FDI foreign direct investment Latin America"
+LATEST_WEB_QUERY = (
+    "(FDI OR 'foreign direct investment') Latin America site:reuters.com OR site:bloomberg.com "
+    "OR site:bloomberglinea.com OR site:bnamericas.com"
+)
+DATE_WEB_SITES = "site:reuters.com OR site:bloomberg.com OR site:ft.com OR site:bloomberglinea.com"
+
+# Query variants fanned out next to the main query, one feed each
+FOCUS_COUNTRIES = ['Argentina', 'Brazil', 'Chile', 'Colombia', 'Mexico', 'Peru']
+COUNTRY_QUERIES = [f'"foreign direct investment" {country}' for country in FOCUS_COUNTRIES]
+SECTOR_QUERIES = [f'{sector} investment Latin America' for sector in SECTOR_KEYWORDS]
+
+# Additional RSS/Atom feeds (comma-separated URLs) polled with every search
+EXTRA_FEEDS = [url.strip() for url in os.environ.get('FDI_EXTRA_FEEDS', '').split(',') if url.strip()]
+WEB_SEARCH_ENABLED = os.environ.get('FDI_WEB_SEARCH', '1').lower() not in ('0', 'false', 'no')
+
+
+def latest_sources(query: str, num_results: int) -> List[Source]:
+    """Sources for a general search: the user's query, the standing queries and their variants."""
+    queries = dict.fromkeys([query, LATEST_FEED_QUERY] + COUNTRY_QUERIES + SECTOR_QUERIES)
+    limit = num_results * 3
+    sources: List[Source] = [
+        FeedSource(google_news_feed_url(q, when='10d'), name=q, limit=limit) for q in queries
+    ]
+    sources.extend(FeedSource(url, limit=limit) for url in EXTRA_FEEDS)
+    if WEB_SEARCH_ENABLED:
+        sources.append(WebSearchSource(LATEST_WEB_QUERY, num_results=min(25, num_results * 3)))
+    return sources
+
+
+def date_bounded_query(query: str, start: date, end: date) -> str:
+    """
+    `query` restricted to articles published around `start`..`end` with Google's after:/before:.
+
+    The bounds are padded by a day on each side because Google applies them in
+    its own timezone; callers filter the entries to the exact days.
+    """
+    return f"{query} after:{start - timedelta(days=1):%Y-%m-%d} before:{end + timedelta(days=1):%Y-%m-%d}"
+
+
+def _published_day(candidate: Candidate) -> Optional[str]:
+    if not candidate.published_parsed:
+        return None
+    return datetime(*candidate.published_parsed[:6]).strftime('%Y-%m-%d')
+
+
+def _published_on(search_date: str):
+    def matches(candidate: Candidate) -> bool:
+        # Undated entries are kept; the article download decides their relevance
+        day = _published_day(candidate)
+        return day is None or day == search_date
+    return matches
+
+
+def date_sources(search_date: str, num_results: int) -> List[Source]:
+    """Sources for one publish date: the date feed and country variants, bounded and filtered to that day."""
+    day = datetime.strptime(search_date, '%Y-%m-%d').date()
+    queries = [DATE_FEED_QUERY] + COUNTRY_QUERIES
+    limit = num_results * 4
+    entry_filter = _published_on(search_date)
+    sources: List[Source] = [
+        FeedSource(google_news_feed_url(date_bounded_query(q, day, day)), name=q, limit=limit,
+                   entry_filter=entry_filter)
+        for q in queries
+    ]
+    sources.extend(
+        FeedSource(url, limit=limit, entry_filter=entry_filter) for url in EXTRA_FEEDS
+    )
+    if WEB_SEARCH_ENABLED:
+        sources.append(WebSearchSource(
+            f"{DATE_FEED_QUERY} {search_date} {DATE_WEB_SITES}", num_results=min(20, num_results * 3)
+        ))
+    return sources
+
+
+def range_sources(start: date, end: date) -> List[Source]:
+    """Feed sources for a backfill window: the date feed and country variants bounded to `start`..`end`."""
+    queries = [DATE_FEED_QUERY] + COUNTRY_QUERIES
+    sources: List[Source] = [
+        FeedSource(google_news_feed_url(date_bounded_query(q, start, end)), name=q) for q in queries
+    ]
+    sources.extend(FeedSource(url) for url in EXTRA_FEEDS)
+    return sources
+
+
+def date_windows(start: date, end: date, days: int) -> List[Tuple[date, date]]:
+    """Split `start`..`end` (inclusive) into consecutive windows of at most `days` days."""
+    windows = []
+    window_start = start
+    while window_start <= end:
+        window_end = min(end, window_start + timedelta(days=max(1, days) - 1))
+        windows.append((window_start, window_end))
+        window_start = window_end + timedelta(days=1)
+    return windows
+
+
+def scrape_date_range(start: date, end: date, seen: Optional[set] = None) -> Dict[str, List[Dict]]:
+    """
+    Collect the news published from `start` through `end`, keyed by publish day.
+
+    Every source is polled once for the whole range. Candidates are bucketed by
+    publish day in a single pass; undated ones, those outside the range and
+    links in `seen` are dropped. The remaining unique URLs are downloaded once,
+    in one ranked batch. Links scraped here are added to `seen`. Web search
+    isn't used: its hits carry no publish date to bucket on before download.
+    """
+    seen = seen if seen is not None else set()
+    first, last = start.strftime('%Y-%m-%d'), end.strftime('%Y-%m-%d')
+
+    day_by_link: Dict[str, str] = {}
+    unique: List[Candidate] = []
+    undated = 0
+    for candidate in gather_candidates(range_sources(start, end)):
+        day = _published_day(candidate)
+        if day is None:
+            undated += 1
+            continue
+        if not first <= day <= last or candidate.link in seen:
+            continue
+        day_by_link[candidate.link] = day
+        unique.append(candidate)
+    seen.update(day_by_link)
+
+    by_day: Dict[str, List[Dict]] = defaultdict(list)
+    for item in scrape_candidates(unique):
+        day = day_by_link[item['url']]
+        item['date'] = day
+        item['search_date'] = day
+        by_day[day].append(item)
+    print(f"Range {first}..{last}: {len(unique)} unique dated entries ({undated} undated skipped), "
+          f"{sum(len(items) for items in by_day.values())} relevant")
+    return dict(by_day)
+
+
+def search_fdi_news(query: str = "FDI projects Latin America", num_results: int = 20,
+                    deadline: Optional[Deadline] = None):
+    """Search every source for `query`; with a `deadline`, returns what was found in time (see Deadline.partial)."""
+    try:
+        candidates = gather_candidates(latest_sources(query, num_results), deadline)
+        return scrape_candidates(candidates, num_results, deadline=deadline)
     except Exception as exc:
-        print(f"Error fetching Google News by date: {exc}")
+        print(f"Error searching FDI news: {exc}")
+        return []
 
-    if len(news_items) < num_results:
-        try:
-            date_query = f"{base_query} {search_date}"
-            fallback_query = (
-                f"{date_query} site:reuters.com OR site:bloomberg.com OR site:ft.com OR site:bloomberglinea.com"
-            )
-            for url in search(fallback_query, num=min(20, num_results * 3), stop=20):
-                if url in urls_found:
-                    continue
-
-                try:
-                    article = parse_article(url)
-                except Exception:
-                    continue
-
-                if not is_fdi_latin_america_related(article.title or '', article.text[:300], article.text):
-                    continue
-
-                news_items.append(
-                    build_news_item(
-                        title=article.title or 'No title',
-                        url=url,
-                        summary=article.text[:600],
-                        published=article.publish_date.strftime('%Y-%m-%d') if article.publish_date else search_date,
-                        source=url.split('/')[2] if '/' in url else 'Unknown',
-                        text=article.text,
-                        origin='web',
-                    )
-                )
-                news_items[-1]['date'] = search_date
-                urls_found.add(url)
-                if len(news_items) >= num_results:
-                    break
-                time.sleep(0.5)
-        except Exception as exc:
-            print(f"Error in date-specific web search: {exc}")
-
-    return news_items[:num_results]
+
+def search_fdi_news_by_date(search_date: str, num_results: int = 10,
+                            deadline: Optional[Deadline] = None):
+    try:
+        datetime.strptime(search_date, '%Y-%m-%d')
+    except ValueError:
+        return []
+
+    try:
+        candidates = gather_candidates(date_sources(search_date, num_results), deadline)
+        news_items = scrape_candidates(candidates, num_results, default_published=search_date, deadline=deadline)
+    except Exception as exc:
+        print(f"Error searching FDI news by date: {exc}")
+        return []
+
+    for item in news_items:
+        item['date'] = search_date
+    return news_items
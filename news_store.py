@@ -0,0 +1,596 @@
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+import os
+import sqlite3
+import sys
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from email.utils import parsedate_to_datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from cache import connect
+from dedupe import SIMILARITY_THRESHOLD, decode_signature, encode_signature, lsh_buckets, similarity
+from entities import find_amount
+
+NEWS_DB_PATH = os.environ.get('FDI_NEWS_DB_PATH', 'data/news.sqlite3')
+
+_SCHEMA = [
+    '''CREATE TABLE IF NOT EXISTS news (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        url TEXT NOT NULL UNIQUE,
+        published_date TEXT,
+        country TEXT,
+        sector TEXT,
+        relevance_score REAL,
+        origin TEXT,
+        search_date TEXT,
+        collected_at TEXT,
+        data TEXT NOT NULL
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_news_published_date ON news (published_date)',
+    'CREATE INDEX IF NOT EXISTS idx_news_country ON news (country)',
+    'CREATE INDEX IF NOT EXISTS idx_news_sector ON news (sector)',
+    'CREATE INDEX IF NOT EXISTS idx_news_relevance_score ON news (relevance_score)',
+    'CREATE INDEX IF NOT EXISTS idx_news_search_date ON news (search_date)',
+    'CREATE INDEX IF NOT EXISTS idx_news_origin ON news (origin)',
+    # Every country/sector an item mentions, so filters match more than the first one
+    '''CREATE TABLE IF NOT EXISTS news_tags (
+        news_id INTEGER NOT NULL REFERENCES news (id) ON DELETE CASCADE,
+        kind TEXT NOT NULL,
+        value TEXT NOT NULL,
+        PRIMARY KEY (kind, value, news_id)
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_news_tags_news_id ON news_tags (news_id)',
+    # Full article text, kept out of the item JSON and only read when asked for
+    '''CREATE TABLE IF NOT EXISTS news_content (
+        news_id INTEGER PRIMARY KEY REFERENCES news (id) ON DELETE CASCADE,
+        content TEXT NOT NULL
+    )''',
+    # MinHash signatures and LSH buckets of each story's text for near-duplicate lookups (see dedupe.py)
+    '''CREATE TABLE IF NOT EXISTS news_signatures (
+        url TEXT PRIMARY KEY,
+        signature TEXT NOT NULL
+    )''',
+    # Collection version, bumped by every write that changes what readers see (used for ETags)
+    '''CREATE TABLE IF NOT EXISTS news_meta (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    )''',
+    '''CREATE TABLE IF NOT EXISTS news_lsh_buckets (
+        band INTEGER NOT NULL,
+        bucket INTEGER NOT NULL,
+        url TEXT NOT NULL,
+        PRIMARY KEY (band, bucket, url)
+    )''',
+    # Item counts and summed USD amounts per country, sector, source and publish week, kept
+    # current by merge() so dashboards read a few rows instead of aggregating every item
+    '''CREATE TABLE IF NOT EXISTS news_rollups (
+        dimension TEXT NOT NULL,
+        key TEXT NOT NULL,
+        items INTEGER NOT NULL,
+        amount_items INTEGER NOT NULL,
+        amount_usd REAL NOT NULL,
+        PRIMARY KEY (dimension, key)
+    )''',
+    'CREATE INDEX IF NOT EXISTS idx_news_rollups_items ON news_rollups (dimension, items)',
+]
+
+# Filters accepted by NewsStore.query(), mapped to their SQL condition
+_FILTERS = {
+    'country': "id IN (SELECT news_id FROM news_tags WHERE kind = 'country' AND value = ?)",
+    'sector': "id IN (SELECT news_id FROM news_tags WHERE kind = 'sector' AND value = ?)",
+    'date_from': 'published_date >= ?',
+    'date_to': 'published_date <= ?',
+    'min_score': 'relevance_score >= ?',
+    'origin': 'origin = ?',
+    'search_date': 'search_date = ?',
+}
+
+
+# Rollup dimensions reported by NewsStore.stats(), besides the single ('total', 'all') row
+ROLLUP_DIMENSIONS = ('country', 'sector', 'source', 'week')
+
+
+def normalize_published_date(published: str) -> Optional[str]:
+    """Turn RSS (RFC 822) or ISO publish dates into a sortable YYYY-MM-DD string."""
+    if not published:
+        return None
+    try:
+        return parsedate_to_datetime(published).strftime('%Y-%m-%d')
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(published[:19]).strftime('%Y-%m-%d')
+    except ValueError:
+        return None
+
+
+def encode_cursor(news_id: int) -> str:
+    return base64.urlsafe_b64encode(str(news_id).encode('ascii')).decode('ascii')
+
+
+def decode_cursor(cursor: str) -> Optional[int]:
+    """Return the id a cursor points after, or None for an empty/invalid cursor."""
+    if not cursor:
+        return None
+    try:
+        return int(base64.urlsafe_b64decode(cursor.encode('ascii')).decode('ascii'))
+    except (binascii.Error, UnicodeError, ValueError):
+        return None
+
+
+def _amount_usd(item: Dict) -> Optional[float]:
+    # Items stored before amounts were normalized only have the text; parse it on load
+    if 'amount_usd' in item:
+        return item['amount_usd']
+    amount = find_amount(item.get('amount') or '')
+    return amount.usd if amount else None
+
+
+def publish_week(published: str) -> Optional[str]:
+    """Monday (YYYY-MM-DD) of the ISO week an item was published in, or None if undated."""
+    day = normalize_published_date(published)
+    if day is None:
+        return None
+    parsed = datetime.strptime(day, '%Y-%m-%d')
+    return (parsed - timedelta(days=parsed.weekday())).strftime('%Y-%m-%d')
+
+
+def _text(value) -> str:
+    return '' if value is None else str(value)
+
+
+def _intern(value) -> str:
+    # Interned strings live for the whole process, so only values drawn from a small set belong here
+    return sys.intern(value) if isinstance(value, str) else _text(value)
+
+
+@dataclass(slots=True)
+class NewsRecord:
+    """
+    Compact form of a collected news item, without its article text.
+
+    Low-cardinality strings (source, origin, countries, sectors) are interned
+    so records share them; the full `content` lives in the store's
+    content table and is only loaded on request.
+    """
+
+    url: str
+    title: str = ''
+    summary: str = ''
+    published: str = ''
+    source: str = ''
+    relevance_score: float = 0
+    countries: Tuple[str, ...] = ()
+    sectors: Tuple[str, ...] = ()
+    amount: str = ''
+    amount_usd: Optional[float] = None
+    company: str = ''
+    origin: str = ''
+    collected_at: str = ''
+    search_date: Optional[str] = None
+    date: Optional[str] = None
+    sources: Optional[Tuple[Dict, ...]] = None
+    extra: Dict = field(default_factory=dict)
+
+    _FIELDS = ('url', 'title', 'summary', 'published', 'source', 'relevance_score', 'countries', 'sectors',
+               'amount', 'amount_usd', 'company', 'origin', 'collected_at', 'search_date', 'date', 'sources')
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'NewsRecord':
+        countries = item.get('countries') or ([item['country']] if item.get('country') else [])
+        sectors = item.get('sectors') or ([item['sector']] if item.get('sector') else [])
+        sources = item.get('sources')
+        return cls(
+            url=item.get('url') or '',
+            title=item.get('title') or '',
+            summary=item.get('summary') or '',
+            published=_text(item.get('published')),
+            source=_intern(item.get('source')),
+            relevance_score=item.get('relevance_score') or 0,
+            countries=tuple(_intern(value) for value in countries),
+            sectors=tuple(_intern(value) for value in sectors),
+            amount=item.get('amount') or '',
+            amount_usd=_amount_usd(item),
+            company=item.get('company') or '',
+            origin=_intern(item.get('origin')),
+            collected_at=_text(item.get('collected_at')),
+            search_date=_text(item['search_date']) if item.get('search_date') else None,
+            date=_text(item['date']) if item.get('date') else None,
+            sources=tuple(sources) if sources is not None else None,
+            extra={key: value for key, value in item.items()
+                   if key not in cls._FIELDS and key not in ('content', 'country', 'sector')},
+        )
+
+    def to_dict(self, content: Optional[str] = None) -> Dict:
+        """The API/JSON shape of the item; `content` is only included when passed."""
+        item = {
+            'title': self.title,
+            'url': self.url,
+            'summary': self.summary,
+            'published': self.published,
+            'source': self.source,
+            'relevance_score': self.relevance_score,
+            'countries': list(self.countries),
+            'country': self.countries[0] if self.countries else '',
+            'sectors': list(self.sectors),
+            'sector': self.sectors[0] if self.sectors else '',
+            'amount': self.amount,
+            'amount_usd': self.amount_usd,
+            'company': self.company,
+            'origin': self.origin,
+            'collected_at': self.collected_at,
+            **self.extra,
+        }
+        for name in ('search_date', 'date'):
+            if getattr(self, name) is not None:
+                item[name] = getattr(self, name)
+        if self.sources is not None:
+            item['sources'] = list(self.sources)
+        if content is not None:
+            item['content'] = content
+        return item
+
+    def tags(self) -> List[Tuple[str, str]]:
+        tags = {('country', value) for value in self.countries if value}
+        tags.update(('sector', value) for value in self.sectors if value)
+        return sorted(tags)
+
+    def rollup_keys(self) -> List[Tuple[str, str]]:
+        """The (dimension, key) rollup rows this item counts towards."""
+        keys = [('total', 'all')]
+        keys.extend(self.tags())
+        if self.source:
+            keys.append(('source', self.source))
+        week = publish_week(self.published)
+        if week:
+            keys.append(('week', week))
+        return keys
+
+
+def _row_values(record: NewsRecord) -> tuple:
+    return (
+        normalize_published_date(record.published),
+        record.countries[0] if record.countries else None,
+        record.sectors[0] if record.sectors else None,
+        record.relevance_score,
+        record.origin or None,
+        record.search_date or None,
+        record.collected_at or None,
+        json.dumps(record.to_dict(), ensure_ascii=False),
+    )
+
+
+class NewsStore:
+    """
+    Collected news persisted in SQLite, newest first.
+
+    Each item is stored as JSON (without its article text, which lives in
+    news_content), with the fields we sort and filter on copied into indexed
+    columns. The database file is shared by every gunicorn worker, so all of
+    them see the same collection.
+    """
+
+    def __init__(self, path: str = NEWS_DB_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid: Optional[int] = None
+
+    def _connection(self) -> sqlite3.Connection:
+        # Reconnect after fork so workers never share a connection handle
+        if self._conn is None or self._pid != os.getpid():
+            conn = connect(self.path)
+            conn.execute('PRAGMA foreign_keys=ON')
+            # Create and migrate under the write lock, so two processes opening a new
+            # database don't both backfill the derived tables
+            conn.execute('BEGIN IMMEDIATE')
+            tables = {name for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            if 'news_tags' not in tables:
+                for news_id, data in conn.execute('SELECT id, data FROM news').fetchall():
+                    self._write_tags(conn, news_id, NewsRecord.from_dict(json.loads(data)))
+            if 'news_rollups' not in tables:
+                for (data,) in conn.execute('SELECT data FROM news').fetchall():
+                    self._add_rollups(conn, NewsRecord.from_dict(json.loads(data)), 1)
+            if 'news_content' not in tables:
+                # Move article text out of the item JSON written by older versions
+                for news_id, data in conn.execute('SELECT id, data FROM news').fetchall():
+                    item = json.loads(data)
+                    self._write_content(conn, news_id, item.pop('content', None))
+                    conn.execute('UPDATE news SET data = ? WHERE id = ?', (json.dumps(item, ensure_ascii=False), news_id))
+            conn.commit()
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Hold the database write lock from the first read, so a read-modify-write
+        can't interleave with another process (ingest daemon, other workers).
+        """
+        with self._lock:
+            conn = self._connection()
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def merge(self, news_items: List[Dict]) -> List[Dict]:
+        """
+        Upsert a batch of items keyed by URL and return the ones that were new.
+
+        Existing items are updated in place (keeping their position); new items
+        are placed ahead of everything already stored, in batch order.
+        """
+        items_by_url: Dict[str, Dict] = {}
+        for item in news_items:
+            url = item.get('url')
+            if url:
+                items_by_url.setdefault(url, {}).update(item)
+        if not items_by_url:
+            return []
+
+        with self._write() as conn:
+            existing = {}
+            urls = list(items_by_url)
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                query = f'SELECT id, url, data FROM news WHERE url IN ({placeholders})'
+                for news_id, url, data in conn.execute(query, batch):
+                    existing[url] = (news_id, json.loads(data))
+
+            fresh_items = [item for url, item in items_by_url.items() if url not in existing]
+            for url, (news_id, stored) in existing.items():
+                # Update metadata for existing entries (summary, relevance, etc.)
+                self._add_rollups(conn, NewsRecord.from_dict(stored), -1)
+                stored.update(items_by_url[url])
+                record = NewsRecord.from_dict(stored)
+                self._add_rollups(conn, record, 1)
+                conn.execute(
+                    'UPDATE news SET published_date = ?, country = ?, sector = ?, relevance_score = ?, '
+                    'origin = ?, search_date = ?, collected_at = ?, data = ? WHERE id = ?',
+                    _row_values(record) + (news_id,),
+                )
+                self._write_tags(conn, news_id, record)
+                self._write_content(conn, news_id, stored.get('content'))
+            # Insert in reverse so the first fresh item gets the highest id
+            for item in reversed(fresh_items):
+                record = NewsRecord.from_dict(item)
+                cursor = conn.execute(
+                    'INSERT INTO news (published_date, country, sector, relevance_score, origin, search_date, '
+                    'collected_at, data, url) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    _row_values(record) + (item['url'],),
+                )
+                self._write_tags(conn, cursor.lastrowid, record)
+                self._write_content(conn, cursor.lastrowid, item.get('content'))
+                self._add_rollups(conn, record, 1)
+            if existing:
+                # An update can move an item to another country/sector/week
+                conn.execute('DELETE FROM news_rollups WHERE items <= 0')
+            self._bump_version(conn)
+        return fresh_items
+
+    @staticmethod
+    def _write_tags(conn: sqlite3.Connection, news_id: int, record: NewsRecord) -> None:
+        conn.execute('DELETE FROM news_tags WHERE news_id = ?', (news_id,))
+        conn.executemany(
+            'INSERT INTO news_tags (news_id, kind, value) VALUES (?, ?, ?)',
+            [(news_id, kind, value) for kind, value in record.tags()],
+        )
+
+    @staticmethod
+    def _add_rollups(conn: sqlite3.Connection, record: NewsRecord, sign: int) -> None:
+        """Count `record` into (sign=1) or out of (sign=-1) every rollup row it belongs to."""
+        has_amount = record.amount_usd is not None
+        amount = sign * (record.amount_usd or 0.0)
+        conn.executemany(
+            'INSERT INTO news_rollups (dimension, key, items, amount_items, amount_usd) VALUES (?, ?, ?, ?, ?) '
+            'ON CONFLICT (dimension, key) DO UPDATE SET items = items + excluded.items, '
+            'amount_items = amount_items + excluded.amount_items, amount_usd = amount_usd + excluded.amount_usd',
+            [(dimension, key, sign, sign if has_amount else 0, amount) for dimension, key in record.rollup_keys()],
+        )
+
+    @staticmethod
+    def _bump_version(conn: sqlite3.Connection) -> None:
+        conn.execute(
+            "INSERT INTO news_meta (key, value) VALUES ('version', 1) "
+            "ON CONFLICT (key) DO UPDATE SET value = value + 1"
+        )
+
+    def version(self) -> int:
+        """Counter that changes whenever stored items change; cheap to read on every request."""
+        with self._lock:
+            row = self._connection().execute("SELECT value FROM news_meta WHERE key = 'version'").fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _write_content(conn: sqlite3.Connection, news_id: int, content: Optional[str]) -> None:
+        # Items merged without content (e.g. metadata updates) keep the stored text
+        if content:
+            conn.execute('INSERT OR REPLACE INTO news_content (news_id, content) VALUES (?, ?)', (news_id, content))
+
+    def content(self, urls: Iterable[str]) -> Dict[str, str]:
+        """Article text of the given stored items, keyed by URL."""
+        urls = list(urls)
+        found = {}
+        with self._lock:
+            conn = self._connection()
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                placeholders = ','.join('?' * len(batch))
+                found.update(conn.execute(
+                    f'SELECT n.url, c.content FROM news n JOIN news_content c ON c.news_id = n.id '
+                    f'WHERE n.url IN ({placeholders})',
+                    batch,
+                ).fetchall())
+        return found
+
+    def add_signature(self, url: str, signature: List[int]) -> None:
+        """Index a story's MinHash signature so later copies can be matched to it."""
+        with self._lock:
+            conn = self._connection()
+            conn.execute(
+                'INSERT OR REPLACE INTO news_signatures (url, signature) VALUES (?, ?)',
+                (url, encode_signature(signature)),
+            )
+            conn.executemany(
+                'INSERT OR IGNORE INTO news_lsh_buckets (band, bucket, url) VALUES (?, ?, ?)',
+                [(band, bucket, url) for band, bucket in lsh_buckets(signature)],
+            )
+            conn.commit()
+
+    def find_near_duplicate(self, signature: List[int]) -> Optional[str]:
+        """Return the URL of a stored story whose text is at least SIMILARITY_THRESHOLD similar."""
+        buckets = lsh_buckets(signature)
+        condition = ' OR '.join(['(b.band = ? AND b.bucket = ?)'] * len(buckets))
+        params = [part for bucket in buckets for part in bucket]
+        # Joining on news skips signatures whose story was never stored (or was cleared)
+        with self._lock:
+            rows = self._connection().execute(
+                f'SELECT DISTINCT s.url, s.signature FROM news_lsh_buckets b '
+                f'JOIN news_signatures s ON s.url = b.url JOIN news n ON n.url = b.url WHERE {condition}',
+                params,
+            ).fetchall()
+        for url, candidate in rows:
+            if similarity(decode_signature(candidate), signature) >= SIMILARITY_THRESHOLD:
+                return url
+        return None
+
+    def add_sources(self, url: str, sources: List[Dict]) -> None:
+        """Attach extra copies of a story (syndicated/republished URLs) to its stored record."""
+        with self._write() as conn:
+            row = conn.execute('SELECT id, data FROM news WHERE url = ?', (url,)).fetchone()
+            if row is None:
+                return
+            news_id, data = row
+            item = json.loads(data)
+            known = {source.get('url') for source in item.get('sources', [])} | {url}
+            item['sources'] = item.get('sources', []) + [s for s in sources if s.get('url') not in known]
+            conn.execute('UPDATE news SET data = ? WHERE id = ?', (json.dumps(item, ensure_ascii=False), news_id))
+            self._bump_version(conn)
+
+    @staticmethod
+    def _where(filters: Dict) -> Tuple[List[str], list]:
+        conditions, params = [], []
+        for name, condition in _FILTERS.items():
+            value = filters.get(name)
+            if value not in (None, ''):
+                conditions.append(condition)
+                params.append(value)
+        return conditions, params
+
+    def query(self, limit: int, after: Optional[int] = None, offset: int = 0, include_content: bool = False,
+              **filters) -> Tuple[List[Dict], Optional[int]]:
+        """
+        Return up to `limit` items matching `filters`, newest first.
+
+        Pass `after` (the last id of the previous page) for keyset pagination,
+        which stays fast however deep the page; `offset` is kept for page-number
+        clients. Also returns the id to continue from, or None on the last page.
+        Article text is only read (and added as `content`) with include_content.
+        """
+        conditions, params = self._where(filters)
+        if after is not None:
+            conditions.append('id < ?')
+            params.append(after)
+        query = 'SELECT id, data FROM news'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        query += ' ORDER BY id DESC LIMIT ? OFFSET ?'
+        params.extend([max(0, limit) + 1, max(0, offset)])
+        if include_content:
+            query = (f'SELECT n.id, n.data, c.content FROM ({query}) n '
+                     f'LEFT JOIN news_content c ON c.news_id = n.id ORDER BY n.id DESC')
+        with self._lock:
+            rows = self._connection().execute(query, params).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:max(0, limit)]
+        next_id = rows[-1][0] if has_more and rows else None
+        items = []
+        for row in rows:
+            item = json.loads(row[1])
+            if include_content:
+                item['content'] = row[2] or ''
+            items.append(item)
+        return items, next_id
+
+    def page(self, limit: int, offset: int = 0, search_date: Optional[str] = None) -> List[Dict]:
+        return self.query(limit, offset=offset, search_date=search_date)[0]
+
+    def iter_items(self, batch_size: int = 500, include_content: bool = False) -> Iterator[Dict]:
+        """Yield every stored item newest first, reading one keyset page at a time."""
+        after = None
+        while True:
+            items, after = self.query(batch_size, after=after, include_content=include_content)
+            yield from items
+            if after is None:
+                break
+
+    def all(self, include_content: bool = False) -> List[Dict]:
+        return list(self.iter_items(include_content=include_content))
+
+    def count(self, **filters) -> int:
+        conditions, params = self._where(filters)
+        query = 'SELECT COUNT(*) FROM news'
+        if conditions:
+            query += ' WHERE ' + ' AND '.join(conditions)
+        with self._lock:
+            (total,) = self._connection().execute(query, params).fetchone()
+        return total
+
+    def stats(self, limit: int = 20, weeks: int = 52) -> Dict:
+        """
+        Item counts and summed USD amounts from the rollup table.
+
+        Returns the overall total, the `limit` largest countries, sectors and
+        sources by item count, and the latest `weeks` publish weeks in date
+        order. Only rollup rows are read, so the cost doesn't grow with the
+        number of stored items.
+        """
+        def row(key, items, amount_items, amount_usd) -> Dict:
+            return {'key': key, 'count': items, 'with_amount': amount_items, 'amount_usd': round(amount_usd, 2)}
+
+        with self._lock:
+            conn = self._connection()
+            total = conn.execute(
+                "SELECT key, items, amount_items, amount_usd FROM news_rollups WHERE dimension = 'total'"
+            ).fetchone()
+            stats = {'total': row(*total) if total else row('all', 0, 0, 0.0)}
+            for dimension in ('country', 'sector', 'source'):
+                stats[dimension] = [row(*values) for values in conn.execute(
+                    'SELECT key, items, amount_items, amount_usd FROM news_rollups WHERE dimension = ? '
+                    'ORDER BY items DESC, key LIMIT ?',
+                    (dimension, max(0, limit)),
+                )]
+            latest = conn.execute(
+                "SELECT key, items, amount_items, amount_usd FROM news_rollups WHERE dimension = 'week' "
+                'ORDER BY key DESC LIMIT ?',
+                (max(0, weeks),),
+            ).fetchall()
+            stats['week'] = [row(*values) for values in reversed(latest)]
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            conn = self._connection()
+            conn.execute('DELETE FROM news_rollups')
+            conn.execute('DELETE FROM news_tags')
+            conn.execute('DELETE FROM news_content')
+            conn.execute('DELETE FROM news_lsh_buckets')
+            conn.execute('DELETE FROM news_signatures')
+            conn.execute('DELETE FROM news')
+            self._bump_version(conn)
+            conn.commit()
@@ -0,0 +1,95 @@
+"""
+Response encoding for the API: a fast JSON provider and gzip/brotli compression.
+
+orjson and brotli are optional; without them the app falls back to Flask's
+default JSON provider and gzip-only compression.
+"""
+from __future__ import annotations
+
+import decimal
+import gzip
+import os
+from typing import Any
+
+from flask import Request, Response
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# Responses smaller than this aren't worth compressing
+COMPRESS_MIN_BYTES = int(os.environ.get('FDI_COMPRESS_MIN_BYTES', '1024'))
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+_COMPRESSIBLE_TYPES = ('application/json', 'text/')
+
+
+def _orjson_default(value: Any):
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, '__html__'):
+        return str(value.__html__())
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+class OrjsonProvider(DefaultJSONProvider):
+    """Serialize with orjson (UTF-8, never ASCII-escaped); parsing stays on the stdlib."""
+
+    def dumps(self, obj: Any, **kwargs) -> str:
+        return orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+
+    def response(self, *args, **kwargs) -> Response:
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def json_provider_class():
+    return OrjsonProvider if orjson is not None else DefaultJSONProvider
+
+
+def _choose_encoding(request: Request):
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+
+def compress_response(request: Request, response: Response) -> Response:
+    """Compress a buffered text/JSON response with the best encoding the client accepts."""
+    response.vary.add('Accept-Encoding')
+    if (
+        response.direct_passthrough
+        or response.is_streamed
+        or response.status_code < 200
+        or response.status_code in (204, 304)
+        or 'Content-Encoding' in response.headers
+        or not (response.mimetype or '').startswith(_COMPRESSIBLE_TYPES)
+    ):
+        return response
+
+    encoding = _choose_encoding(request)
+    if encoding is None:
+        return response
+    data = response.get_data()
+    if len(data) < COMPRESS_MIN_BYTES:
+        return response
+
+    if encoding == 'br':
+        compressed = brotli.compress(data, quality=BROTLI_QUALITY)
+    else:
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL)
+    response.set_data(compressed)
+    response.headers['Content-Encoding'] = encoding
+    if response.headers.get('ETag') and not response.headers['ETag'].startswith('W/'):
+        # The body bytes differ per encoding, so a strong validator would be wrong
+        response.headers['ETag'] = 'W/' + response.headers['ETag']
+    return response
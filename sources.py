@@ -0,0 +1,163 @@
+"""
+Candidate sources for a search: RSS feeds and web search, fanned out concurrently.
+
+Each Source returns Candidates (a link plus whatever the source knows about it
+before download). gather_candidates() runs every source at once, gives each its
+own deadline, and merges what came back into one deduplicated list, so a search
+takes as long as its slowest allowed source rather than the sum of all of them.
+"""
+from __future__ import annotations
+
+import abc
+import contextvars
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+from googlesearch import search
+
+from deadlines import Deadline
+from feeds import fetch_feed
+from metrics import timed
+
+FEED_DEADLINE = float(os.environ.get('FDI_FEED_DEADLINE', '8'))
+WEB_SEARCH_DEADLINE = float(os.environ.get('FDI_WEB_SEARCH_DEADLINE', '10'))
+
+_TITLE_SUFFIX_RE = re.compile(r'\s+-\s+[^-]+$')
+_NON_WORD_RE = re.compile(r'\W+')
+
+
+@dataclass
+class Candidate:
+    """A link worth considering, with the metadata its source provided."""
+
+    link: str
+    title: str = ''
+    summary: str = ''
+    published: str = ''
+    published_parsed: Optional[tuple] = None
+    source: str = ''
+    origin: str = 'rss'
+    # Web hits have no title/summary to score, so they skip the feed prefilter
+    prefilter: bool = True
+    score: int = 0
+    found_by: List[str] = field(default_factory=list)
+
+    @classmethod
+    def from_entry(cls, entry, source_name: str = '') -> 'Candidate':
+        return cls(
+            link=entry.get('link', ''),
+            title=entry.get('title', '') or '',
+            summary=entry.get('summary', '') or '',
+            published=entry.get('published', '') or '',
+            published_parsed=tuple(entry['published_parsed'][:9]) if entry.get('published_parsed') else None,
+            source=(entry.get('source') or {}).get('title', '') or 'Google News',
+            found_by=[source_name] if source_name else [],
+        )
+
+    def title_key(self) -> str:
+        """Headline without the trailing ' - Publisher', for matching the same story across feeds."""
+        return _NON_WORD_RE.sub(' ', _TITLE_SUFFIX_RE.sub('', self.title).lower()).strip()
+
+
+class Source(abc.ABC):
+    """Something that yields candidates for a search within `deadline` seconds."""
+
+    name = 'source'
+    deadline = FEED_DEADLINE
+
+    @abc.abstractmethod
+    def fetch(self) -> List[Candidate]:
+        """Return this source's candidates; called on a worker thread."""
+
+
+class FeedSource(Source):
+    """An RSS/Atom feed polled through the conditional-GET feed cache."""
+
+    def __init__(self, url: str, name: Optional[str] = None, limit: Optional[int] = None,
+                 entry_filter: Optional[Callable[[Candidate], bool]] = None, deadline: float = FEED_DEADLINE):
+        self.url = url
+        self.name = name or url
+        self.limit = limit
+        self.entry_filter = entry_filter
+        self.deadline = deadline
+
+    def fetch(self) -> List[Candidate]:
+        with timed('feed_fetch'):
+            # The request itself ends with the deadline, so an abandoned fetch doesn't linger
+            feed = fetch_feed(self.url, timeout=self.deadline)
+        candidates = [Candidate.from_entry(entry, self.name) for entry in feed.entries[:self.limit]]
+        if self.entry_filter is not None:
+            candidates = [candidate for candidate in candidates if self.entry_filter(candidate)]
+        return candidates
+
+
+class WebSearchSource(Source):
+    """Google web search hits; only URLs are known until the pages are downloaded."""
+
+    def __init__(self, query: str, num_results: int, name: str = 'web', deadline: float = WEB_SEARCH_DEADLINE):
+        self.query = query
+        self.num_results = num_results
+        self.name = name
+        self.deadline = deadline
+
+    def fetch(self) -> List[Candidate]:
+        with timed('web_search'):
+            urls = list(dict.fromkeys(search(self.query, num_results=self.num_results)))
+        return [Candidate(link=url, origin='web', prefilter=False, found_by=[self.name]) for url in urls]
+
+
+def _merge(candidates: Sequence[Candidate]) -> List[Candidate]:
+    """Drop repeated links and the same headline syndicated under different links; first seen wins."""
+    by_link: Dict[str, Candidate] = {}
+    by_title: Dict[str, Candidate] = {}
+    for candidate in candidates:
+        if not candidate.link:
+            continue
+        key = candidate.title_key() if candidate.title else ''
+        existing = by_link.get(candidate.link) or (by_title.get(key) if key else None)
+        if existing is not None:
+            existing.found_by.extend(name for name in candidate.found_by if name not in existing.found_by)
+            continue
+        by_link[candidate.link] = candidate
+        if key:
+            by_title[key] = candidate
+    return list(by_link.values())
+
+
+def gather_candidates(sources: Sequence[Source], deadline: Optional[Deadline] = None) -> List[Candidate]:
+    """
+    Run every source concurrently and merge their candidates, in source order.
+
+    A source that fails or misses its deadline (or the request `deadline`,
+    whichever comes first) contributes nothing; its thread is abandoned rather
+    than waited for.
+    """
+    if not sources:
+        return []
+    deadline = deadline or Deadline()
+    executor = ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix='fdi-source')
+    started = time.monotonic()
+    futures = [(source, executor.submit(contextvars.copy_context().run, source.fetch)) for source in sources]
+    collected: List[Candidate] = []
+    try:
+        for source, future in futures:
+            remaining = max(0.0, started + source.deadline - time.monotonic())
+            request_remaining = deadline.remaining()
+            cut_by_request = request_remaining is not None and request_remaining < remaining
+            try:
+                collected.extend(future.result(timeout=request_remaining if cut_by_request else remaining))
+            except TimeoutError:
+                if cut_by_request:
+                    deadline.cut('sources')
+                    print(f"Source {source.name} cut off by the request deadline")
+                else:
+                    print(f"Source {source.name} missed its {source.deadline:.0f}s deadline")
+            except Exception as exc:
+                print(f"Error fetching source {source.name}: {exc}")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return _merge(collected)
@@ -2,6 +2,13 @@ let allNews = [];
 let filteredNews = [];
 let currentPage = 1;
 const perPage = 9;
+const jobPollInterval = 1500;
+const newsRefreshInterval = 30000;
+const newsRefreshSize = 50;
+let newsEtag = null;
+let statsEtag = null;
+const dashboardSize = 8;
+const dashboardWeeks = 12;
 const filters = {
     country: 'all',
     sector: 'all',
@@ -41,26 +48,147 @@ const textFilter = document.getElementById('textFilter');
 const resetFiltersBtn = document.getElementById('resetFilters');
 const activeFilters = document.getElementById('activeFilters');
 
+// Dashboard elements
+const dashboardTotal = document.getElementById('dashboardTotal');
+const countryChart = document.getElementById('countryChart');
+const sectorChart = document.getElementById('sectorChart');
+const sourceChart = document.getElementById('sourceChart');
+const weekChart = document.getElementById('weekChart');
+
 // Set max date to today
 dateInput.max = new Date().toISOString().split('T')[0];
 
+// Start a background job and render its items as they become ready
+async function runJob(url, options) {
+    const response = await fetch(url, options);
+    const data = await response.json();
+
+    if (!data.success) {
+        throw new Error(data.error);
+    }
+
+    ingestNews(data.news);
+    if (!data.job_id) {
+        // Served straight from the store; nothing left to wait for
+        return { status: 'done', completed: data.count };
+    }
+    return pollJob(data.job_id);
+}
+
+async function pollJob(jobId) {
+    let since = 0;
+    while (true) {
+        const response = await fetch(`/api/jobs/${jobId}?since=${since}`);
+        const data = await response.json();
+
+        if (!data.success) {
+            throw new Error(data.error);
+        }
+
+        const job = data.job;
+        ingestNews(job.news);
+        since = job.next;
+
+        if (job.status === 'done') {
+            return job;
+        }
+        if (job.status === 'failed') {
+            throw new Error(job.error || 'Job failed');
+        }
+        await new Promise(resolve => setTimeout(resolve, jobPollInterval));
+    }
+}
+
+function ingestNews(items) {
+    if (!items || items.length === 0) {
+        return;
+    }
+    allNews = mergeNews(allNews, items);
+    refreshFilters();
+    applyFilters();
+}
+
+// Re-read the newest stored items; the server answers 304 while nothing changed
+async function refreshStoredNews() {
+    const headers = newsEtag ? { 'If-None-Match': newsEtag } : {};
+    try {
+        const response = await fetch(`/api/news?per_page=${newsRefreshSize}`, { headers, cache: 'no-store' });
+        if (response.status === 304 || !response.ok) {
+            return;
+        }
+        newsEtag = response.headers.get('ETag');
+        const data = await response.json();
+        if (data.success) {
+            ingestNews(data.news);
+        }
+    } catch (error) {
+        // Background refresh only; the next tick retries
+    }
+}
+
+// Re-read the collection aggregates; like the news refresh, a 304 means nothing changed
+async function refreshDashboard() {
+    const headers = statsEtag ? { 'If-None-Match': statsEtag } : {};
+    try {
+        const response = await fetch(`/api/stats?limit=${dashboardSize}&weeks=${dashboardWeeks}`, { headers, cache: 'no-store' });
+        if (response.status === 304 || !response.ok) {
+            return;
+        }
+        statsEtag = response.headers.get('ETag');
+        const data = await response.json();
+        if (data.success) {
+            renderDashboard(data);
+        }
+    } catch (error) {
+        // Background refresh only; the next tick retries
+    }
+}
+
+function formatUsd(value) {
+    if (!value) {
+        return '-';
+    }
+    const units = [[1e9, 'B'], [1e6, 'M'], [1e3, 'K']];
+    for (const [size, suffix] of units) {
+        if (value >= size) {
+            return `US$ ${(value / size).toFixed(1)}${suffix}`;
+        }
+    }
+    return `US$ ${value.toFixed(0)}`;
+}
+
+function renderBars(listEl, rows) {
+    if (!rows.length) {
+        listEl.innerHTML = '<li class="bar-empty">Sem dados</li>';
+        return;
+    }
+    const max = Math.max(...rows.map(row => row.count));
+    listEl.innerHTML = rows.map(row => `
+        <li>
+            <span class="bar-label">${escapeHtml(row.key)}</span>
+            <span class="bar-track"><span class="bar-fill" style="width: ${(row.count / max) * 100}%"></span></span>
+            <span class="bar-value">${row.count} · ${formatUsd(row.amount_usd)}</span>
+        </li>
+    `).join('');
+}
+
+function renderDashboard(stats) {
+    dashboardTotal.textContent = `${stats.total.count} notícias · ${formatUsd(stats.total.amount_usd)}`;
+    renderBars(countryChart, stats.countries);
+    renderBars(sectorChart, stats.sectors);
+    renderBars(sourceChart, stats.sources);
+    renderBars(weekChart, stats.weeks);
+}
+
 // Auto-load latest news on page load
 async function loadLatestNews() {
     loading.classList.remove('hidden');
     newsContainer.innerHTML = '<p class="empty-state">Loading latest FDI news...</p>';
     
     try {
-        const response = await fetch('/api/news/latest');
-        const data = await response.json();
-        
-        if (data.success) {
-            allNews = mergeNews(allNews, data.news);
-            currentPage = 1;
-            refreshFilters();
-            applyFilters();
-        } else {
-            newsContainer.innerHTML = '<p class="empty-state">Error loading news: ' + data.error + '</p>';
-        }
+        await runJob('/api/news/latest');
+        applyFilters();
+        refreshDashboard();
     } catch (error) {
         newsContainer.innerHTML = '<p class="empty-state">Error loading news: ' + error.message + '</p>';
     } finally {
@@ -78,10 +206,9 @@ searchBtn.addEventListener('click', async () => {
     }
     
     loading.classList.remove('hidden');
-    newsContainer.innerHTML = '';
     
     try {
-        const response = await fetch('/api/search', {
+        const job = await runJob('/api/search', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -91,16 +218,9 @@ searchBtn.addEventListener('click', async () => {
                 num_results: 20
             })
         });
-        
-        const data = await response.json();
-        
-        if (data.success) {
-            allNews = mergeNews(allNews, data.news);
-            currentPage = 1;
-            refreshFilters();
-            applyFilters();
-        } else {
-            alert('Error: ' + data.error);
+        refreshDashboard();
+        if (job.partial) {
+            alert('The search ran out of time; showing the articles found so far.');
         }
     } catch (error) {
         alert('Error searching for news: ' + error.message);
@@ -126,10 +246,9 @@ dateSearchBtn.addEventListener('click', async () => {
     }
     
     loading.classList.remove('hidden');
-    newsContainer.innerHTML = '';
     
     try {
-        const response = await fetch('/api/search/date', {
+        const job = await runJob('/api/search/date', {
             method: 'POST',
             headers: {
                 'Content-Type': 'application/json'
@@ -139,23 +258,14 @@ dateSearchBtn.addEventListener('click', async () => {
                 num_results: 20
             })
         });
-        
-        const data = await response.json();
-        
-        if (data.success) {
-            allNews = mergeNews(allNews, data.news);
-            currentPage = 1;
-            refreshFilters();
-            applyFilters();
-
-            // Show success message
-            if (data.count > 0) {
-                alert(`Found ${data.count} articles for ${selectedDate}`);
-            } else {
-                alert(`No articles found for ${selectedDate}. Try a different date.`);
-            }
+        refreshDashboard();
+
+        // Show success message
+        if (job.completed > 0) {
+            const note = job.partial ? ' (search ran out of time; results may be incomplete)' : '';
+            alert(`Found ${job.completed} articles for ${selectedDate}${note}`);
         } else {
-            alert('Error: ' + data.error);
+            alert(`No articles found for ${selectedDate}. Try a different date.`);
         }
     } catch (error) {
         alert('Error searching for news: ' + error.message);
@@ -268,6 +378,7 @@ function displayNews() {
             <div class="meta">
                 <span class="score-pill">Relevância ${(item.relevance_score ?? 0).toFixed(1)}</span>
                 <span>Source: ${escapeHtml(item.source || 'Unknown')}</span>
+                ${item.sources && item.sources.length > 1 ? `<span>+${item.sources.length - 1} more sources</span>` : ''}
                 ${item.published ? `<span>Published: ${item.published}</span>` : ''}
                 ${item.search_date ? `<span>Search Date: ${item.search_date}</span>` : ''}
                 ${item.collected_at ? `<span>Collected: ${item.collected_at}</span>` : ''}
@@ -457,5 +568,8 @@ function applyFilters() {
     updateStats();
 }
 
-// Load latest news on page load
+// Load latest news and the dashboard on page load, then keep both fresh
 loadLatestNews();
+refreshDashboard();
+setInterval(refreshStoredNews, newsRefreshInterval);
+setInterval(refreshDashboard, newsRefreshInterval);
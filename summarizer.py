@@ -1,14 +1,27 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import List, Optional, Sequence, Tuple, Union
 
+import hashlib
+import json
+import os
 import re
+import threading
+import time
+from collections import defaultdict
+from functools import cached_property, lru_cache
 
-from newspaper import Article
 import nltk
+import numpy as np
+import requests
+from scipy import sparse
 from nltk.corpus import stopwords
-from nltk.tokenize import sent_tokenize, word_tokenize
-from transformers import pipeline
+from nltk.tokenize import sent_tokenize
+
+from cache import SUMMARY_CACHE, get_article
+from deadlines import Deadline
+from entities import find_amount, find_company
+from metrics import SUMMARY_CACHE_REQUESTS, SUMMARY_INFERENCE_SECONDS, record_stage, timed
 
 # Download required NLTK data
 try:
@@ -21,114 +34,414 @@ try:
 except LookupError:
     nltk.download('stopwords', quiet=True)
 
-_AI_SUMMARIZER = None
 _SUMMARIZER_MODEL = "sshleifer/distilbart-cnn-12-6"
+_GENERATION_KWARGS = {"max_length": 180, "min_length": 60, "do_sample": False}
+_BATCH_SIZE = int(os.environ.get("FDI_SUMMARY_BATCH_SIZE", "8"))
+# Model tokens per chunk; capped at the model's own input limit
+_CHUNK_TOKENS = int(os.environ.get("FDI_SUMMARY_CHUNK_TOKENS", "1000"))
+_WHITESPACE_RE = re.compile(r"\s+")
+
+# transformer: distilbart via torch (default); quantized: the same model with
+# int8 dynamic quantization; onnx: ONNX Runtime export (needs optimum[onnxruntime]);
+# remote: send chunks to summary_server.py so workers share one loaded model;
+# extractive: no model at all, TF-IDF sentence extraction only.
+LOCAL_BACKENDS = ("transformer", "quantized", "onnx")
+SUMMARIZER_BACKEND = os.environ.get("FDI_SUMMARIZER_BACKEND", "transformer").lower()
+SUMMARIZER_URL = os.environ.get("FDI_SUMMARIZER_URL", "http://127.0.0.1:8765")
+SUMMARIZER_TIMEOUT = float(os.environ.get("FDI_SUMMARIZER_TIMEOUT", "300"))
+
+_AI_SUMMARIZERS = {}
+_AI_SUMMARIZER_LOCK = threading.Lock()
+
+# How long the summary server's reported backend is trusted before asking again
+_REMOTE_BACKEND_TTL = 60.0
+_remote_backend: Tuple[Optional[str], float] = (None, 0.0)
+
+
+def _load_pipeline(backend: str):
+    # Heavy imports are deferred until a model is actually needed
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+
+    if backend == "onnx":
+        from optimum.onnxruntime import ORTModelForSeq2SeqLM
+
+        model = ORTModelForSeq2SeqLM.from_pretrained(_SUMMARIZER_MODEL, export=True)
+        return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(_SUMMARIZER_MODEL))
+
+    if backend == "quantized":
+        import torch
+
+        model = AutoModelForSeq2SeqLM.from_pretrained(_SUMMARIZER_MODEL)
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(_SUMMARIZER_MODEL))
+
+    return pipeline("summarization", model=_SUMMARIZER_MODEL)
+
+
+def _get_ai_summarizer(backend: str = SUMMARIZER_BACKEND):
+    """Lazy-load the summarization pipeline for a local backend (once per process)."""
+    with _AI_SUMMARIZER_LOCK:
+        if backend not in _AI_SUMMARIZERS:
+            _AI_SUMMARIZERS[backend] = _load_pipeline(backend)
+        return _AI_SUMMARIZERS[backend]
+
+
+def run_summarization_model(chunks: List[str], batch_size: int = _BATCH_SIZE,
+                            backend: str = SUMMARIZER_BACKEND, timeout: Optional[float] = None) -> List[str]:
+    """Summarize text chunks with the configured model backend, one summary per chunk."""
+    started = time.perf_counter()
+    summaries = _run_backend(chunks, batch_size, backend, timeout)
+    elapsed = time.perf_counter() - started
+    record_stage("summarize_model", elapsed)
+    if chunks:
+        SUMMARY_INFERENCE_SECONDS.observe(elapsed / len(chunks), count=len(chunks), backend=backend)
+    return summaries
+
+
+def _run_backend(chunks: List[str], batch_size: int, backend: str, timeout: Optional[float] = None) -> List[str]:
+    if backend == "remote":
+        response = requests.post(
+            f"{SUMMARIZER_URL}/summarize",
+            json={"chunks": chunks, "batch_size": batch_size},
+            timeout=timeout if timeout is not None else SUMMARIZER_TIMEOUT,
+        )
+        response.raise_for_status()
+        return response.json()["summaries"]
+
+    if backend not in LOCAL_BACKENDS:
+        raise ValueError(f"Unknown summarizer backend: {backend}")
+
+    summarizer = _get_ai_summarizer(backend)
+    outputs = summarizer(chunks, batch_size=max(1, batch_size), truncation=True, **_GENERATION_KWARGS)
+    return [output["summary_text"].strip() for output in outputs]
+
+
+@lru_cache(maxsize=1)
+def _get_tokenizer():
+    """The model's tokenizer (tokenizer files only, no weights), or None when unavailable."""
+    if SUMMARIZER_BACKEND not in LOCAL_BACKENDS:
+        # Remote and extractive workers never load the model: skip importing
+        # transformers and size chunks by the word-count estimate instead
+        return None
+    try:
+        from transformers import AutoTokenizer
 
+        return AutoTokenizer.from_pretrained(_SUMMARIZER_MODEL)
+    except Exception as exc:
+        print(f"Summarizer tokenizer unavailable, estimating token counts: {exc}")
+        return None
 
-def _get_ai_summarizer():
-    """Lazy-load the transformer summarization pipeline."""
-    global _AI_SUMMARIZER
-    if _AI_SUMMARIZER is None:
-        _AI_SUMMARIZER = pipeline("summarization", model=_SUMMARIZER_MODEL)
-    return _AI_SUMMARIZER
 
+def _chunk_token_budget() -> int:
+    tokenizer = _get_tokenizer()
+    if tokenizer is None:
+        return _CHUNK_TOKENS
+    return max(1, min(_CHUNK_TOKENS, tokenizer.model_max_length - tokenizer.num_special_tokens_to_add()))
 
-def _chunk_text(text: str, max_chars: int = 1800) -> List[str]:
-    """Split long articles into smaller chunks to respect token limits."""
-    cleaned = text.replace("\r", " ").replace("  ", " ").strip()
-    if not cleaned:
-        return []
 
-    chunks = []
-    current = []
-    current_len = 0
-    for sentence in sent_tokenize(cleaned):
-        if current_len + len(sentence) > max_chars and current:
-            chunks.append(" ".join(current))
-            current = []
-            current_len = 0
-        current.append(sentence)
-        current_len += len(sentence)
+class PreparedDocument:
+    """
+    One article's text, segmented once and shared by every summarization path.
 
-    if current:
-        chunks.append(" ".join(current))
+    Sentences, per-sentence model token counts and chunk boundaries are
+    computed on first use, so a document whose summary is cached never pays
+    for segmentation, and the extractive fallback reuses the sentences the
+    transformer path already split.
+    """
 
-    return chunks or [cleaned[:max_chars]]
+    def __init__(self, text: Optional[str]):
+        self.text = _WHITESPACE_RE.sub(" ", text or "").strip()
+
+    @property
+    def word_count(self) -> int:
+        return len(self.text.split())
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        return sent_tokenize(self.text) if self.text else []
+
+    @cached_property
+    def token_counts(self) -> List[int]:
+        tokenizer = _get_tokenizer()
+        if tokenizer is None or not self.sentences:
+            return [len(sentence.split()) * 4 // 3 + 1 for sentence in self.sentences]
+        encoded = tokenizer(self.sentences, add_special_tokens=False)["input_ids"]
+        return [len(ids) for ids in encoded]
+
+    @cached_property
+    def chunk_bounds(self) -> List[Tuple[int, int]]:
+        """[start, end) sentence ranges, each packed up to the model's token budget."""
+        budget = _chunk_token_budget()
+        bounds = []
+        start = 0
+        used = 0
+        for index, count in enumerate(self.token_counts):
+            # A sentence over the budget gets a chunk of its own and is truncated by the model
+            if used + count > budget and index > start:
+                bounds.append((start, index))
+                start, used = index, 0
+            used += count
+        if start < len(self.sentences):
+            bounds.append((start, len(self.sentences)))
+        return bounds
+
+    @property
+    def chunks(self) -> List[Tuple[str, int]]:
+        """(chunk text, token count) for each chunk."""
+        return [(" ".join(self.sentences[start:end]), sum(self.token_counts[start:end]))
+                for start, end in self.chunk_bounds]
+
+
+TextOrDocument = Union[str, PreparedDocument]
+
+
+def prepare_document(text: Optional[TextOrDocument]) -> PreparedDocument:
+    return text if isinstance(text, PreparedDocument) else PreparedDocument(text)
+
+
+def _serving_backend() -> str:
+    """The backend that runs the model; for `remote`, the one the summary server reports."""
+    global _remote_backend
+    if SUMMARIZER_BACKEND != "remote":
+        return SUMMARIZER_BACKEND
+    backend, checked_at = _remote_backend
+    if backend is None or time.monotonic() - checked_at > _REMOTE_BACKEND_TTL:
+        response = requests.get(f"{SUMMARIZER_URL}/health", timeout=min(SUMMARIZER_TIMEOUT, 5.0))
+        response.raise_for_status()
+        backend = response.json()["backend"]
+        _remote_backend = (backend, time.monotonic())
+    return f"remote:{backend}"
+
+
+def _summary_cache_key(text: str, backend: str) -> str:
+    """Hash the article text together with everything that affects the model output."""
+    digest = hashlib.sha256()
+    digest.update(_SUMMARIZER_MODEL.encode("utf-8"))
+    digest.update(backend.encode("utf-8"))
+    digest.update(json.dumps({**_GENERATION_KWARGS, "chunk_tokens": _CHUNK_TOKENS}, sort_keys=True).encode("utf-8"))
+    digest.update(text.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def generate_ai_summaries(texts: Sequence[TextOrDocument], batch_size: int = _BATCH_SIZE,
+                          deadline: Optional[Deadline] = None) -> List[Optional[str]]:
+    """
+    Summarize many articles with batched transformer inference.
 
+    Chunks from every article are pooled, sorted by token count so each batch
+    pads as little as possible, run through the pipeline `batch_size` at a time
+    and mapped back to their article. Returns one summary (or None) per input.
 
-def generate_ai_summary(text: str) -> Optional[str]:
-    """Generate an abstractive summary using a transformer pipeline."""
-    if not text or len(text.split()) < 40:
-        return None
+    With a `deadline`, local models run one batch per call and stop when time
+    runs out (a remote call gets the remaining time as its timeout); articles
+    left without every chunk summarized get None, i.e. the extractive fallback.
+    """
+    deadline = deadline or Deadline()
+    results: List[Optional[str]] = [None] * len(texts)
+    if SUMMARIZER_BACKEND == "extractive":
+        return results
+    try:
+        backend = _serving_backend()
+    except Exception as exc:
+        print(f"AI summarizer unavailable: {exc}")
+        return results
+
+    pending: List[Tuple[int, str, List[Tuple[str, int]]]] = []
+    for index, text in enumerate(texts):
+        document = prepare_document(text)
+        if document.word_count < 40:
+            continue
+        cache_key = _summary_cache_key(document.text, backend)
+        cached = SUMMARY_CACHE.get(cache_key)
+        SUMMARY_CACHE_REQUESTS.inc(result="hit" if cached is not None else "miss")
+        if cached is not None:
+            results[index] = cached["summary"]
+        else:
+            pending.append((index, cache_key, document.chunks))
+
+    if not pending:
+        return results
 
     try:
-        summarizer = _get_ai_summarizer()
-        chunks = _chunk_text(text)
-        summaries = []
-        for chunk in chunks:
-            summary = summarizer(
-                chunk,
-                max_length=180,
-                min_length=60,
-                do_sample=False,
-            )[0]["summary_text"].strip()
-            summaries.append(summary)
-        return " ".join(summaries)[:800]
+        chunks = [(index, position, chunk, tokens) for index, _, article_chunks in pending
+                  for position, (chunk, tokens) in enumerate(article_chunks)]
+        chunks.sort(key=lambda item: item[3])
+        chunk_texts = [chunk for _, _, chunk, _ in chunks]
+        step = len(chunk_texts)
+        if deadline.expires_at is not None and SUMMARIZER_BACKEND != "remote":
+            step = max(1, batch_size)
+
+        outputs: List[str] = []
+        for start in range(0, len(chunk_texts), step):
+            if deadline.expired:
+                deadline.cut("summaries")
+                break
+            outputs.extend(run_summarization_model(
+                chunk_texts[start:start + step], batch_size, timeout=deadline.timeout(SUMMARIZER_TIMEOUT)
+            ))
+
+        chunk_summaries = {}
+        for (index, position, _, _), output in zip(chunks, outputs):
+            chunk_summaries[(index, position)] = output
+
+        for index, cache_key, article_chunks in pending:
+            parts = [chunk_summaries.get((index, position)) for position in range(len(article_chunks))]
+            if None in parts:
+                continue
+            result = " ".join(parts)[:800]
+            SUMMARY_CACHE.set(cache_key, {"summary": result})
+            results[index] = result
     except Exception as exc:
         # Fall back to extractive summary when the transformer cannot run
         print(f"AI summarizer unavailable: {exc}")
-        return None
-
 
-def _extractive_summary(text: str, max_sentences: int = 3) -> str:
-    """Simple frequency-based extractive summary as a fallback."""
-    sentences = sent_tokenize(text)
-    if not sentences:
-        return "Unable to extract content from article."
+    return results
 
-    words = word_tokenize(text.lower())
-    try:
-        stop_words = set(stopwords.words('english') + stopwords.words('spanish'))
-    except LookupError:
-        stop_words = set(stopwords.words('english'))
 
-    words = [w for w in words if w.isalnum() and w not in stop_words]
-    word_freq = {}
-    for word in words:
-        word_freq[word] = word_freq.get(word, 0) + 1
+def generate_ai_summary(text: TextOrDocument) -> Optional[str]:
+    """Generate an abstractive summary using a transformer pipeline."""
+    return generate_ai_summaries([text])[0]
 
-    sentence_scores = {}
-    for sentence in sentences:
-        sentence_words = word_tokenize(sentence.lower())
-        score = sum([word_freq.get(word, 0) for word in sentence_words if word.isalnum()])
-        sentence_scores[sentence] = score
 
-    sorted_sentences = sorted(sentence_scores.items(), key=lambda x: x[1], reverse=True)
-    summary = ' '.join([s[0] for s in sorted_sentences[:max_sentences]])
-    return summary[:500]
+# Alphanumeric runs, the same tokens word_tokenize() + isalnum() kept, in one regex pass
+_TERM_RE = re.compile(r"[^\W_]+")
 
 
-def _get_article_text(url: str) -> str:
-    article = Article(url)
-    article.download()
-    article.parse()
-    return article.text or ""
+@lru_cache(maxsize=1)
+def _stop_words() -> frozenset:
+    try:
+        return frozenset(stopwords.words('english') + stopwords.words('spanish'))
+    except LookupError:
+        return frozenset(stopwords.words('english'))
 
 
-def summarize_article(url: str, article_text: Optional[str] = None, max_sentences: int = 3) -> str:
+def extractive_summaries(texts: Sequence[TextOrDocument], max_sentences: int = 3) -> List[str]:
+    """
+    TF-IDF extractive summaries for a whole batch of articles at once.
+
+    Every sentence of every article is tokenized once into a single sparse
+    sentence x term count matrix. Per-article term frequencies and sentence
+    frequencies come from one sparse product with a sentence -> article
+    indicator matrix, and each sentence is scored by the TF-IDF weight of its
+    terms (normalized by sqrt(length) so long sentences don't win by length
+    alone). The best sentences of each article are returned in article order.
+    """
+    stop_words = _stop_words()
+    # Unseen terms get the next column id, so lookups stay in C via map()
+    vocabulary = defaultdict()
+    vocabulary.default_factory = vocabulary.__len__
+    sentences_by_text = []
+    cols = []
+    sentence_lengths = []
+    sentence_docs = []
+
+    for doc, text in enumerate(texts):
+        sentences = prepare_document(text).sentences
+        sentences_by_text.append(sentences)
+        sentence_docs.extend([doc] * len(sentences))
+        for sentence in sentences:
+            terms = [term for term in _TERM_RE.findall(sentence.lower()) if term not in stop_words]
+            cols.extend(map(vocabulary.__getitem__, terms))
+            sentence_lengths.append(len(terms))
+
+    summaries = ["Unable to extract content from article." for _ in texts]
+    num_sentences = len(sentence_docs)
+    if not num_sentences:
+        return summaries
+
+    shape = (num_sentences, max(1, len(vocabulary)))
+    rows = np.repeat(np.arange(num_sentences), sentence_lengths)
+    counts = sparse.csr_matrix((np.ones(len(cols)), (rows, cols)), shape=shape)
+    counts.sum_duplicates()
+    sentence_docs = np.asarray(sentence_docs)
+    doc_of_sentence = sparse.csr_matrix(
+        (np.ones(num_sentences), (sentence_docs, np.arange(num_sentences))),
+        shape=(len(texts), num_sentences),
+    )
+
+    term_freq = (doc_of_sentence @ counts).tocsr()
+    sentence_freq = (doc_of_sentence @ (counts > 0).astype(np.float64)).tocsr()
+    # Same sparsity pattern; sorted indices line their .data arrays up entry for entry
+    term_freq.sort_indices()
+    sentence_freq.sort_indices()
+    sentences_per_doc = np.bincount(sentence_docs, minlength=len(texts)).astype(np.float64)
+
+    # weight = tf * (idf + 1), with idf = log((1 + sentences) / (1 + sentence frequency))
+    weights = term_freq.copy()
+    doc_rows = np.repeat(np.arange(len(texts)), np.diff(term_freq.indptr))
+    weights.data = term_freq.data * (np.log((1 + sentences_per_doc[doc_rows]) / (1 + sentence_freq.data)) + 1)
+
+    lengths = np.asarray(sentence_lengths, dtype=np.float64)
+    raw_scores = np.asarray(counts.multiply(weights[sentence_docs]).sum(axis=1)).ravel()
+    scores = np.divide(raw_scores, np.sqrt(lengths), out=np.zeros(num_sentences), where=lengths > 0)
+
+    offset = 0
+    for doc, sentences in enumerate(sentences_by_text):
+        if sentences:
+            doc_scores = scores[offset:offset + len(sentences)]
+            best = np.sort(np.argsort(-doc_scores, kind='stable')[:max_sentences])
+            summaries[doc] = ' '.join(sentences[index] for index in best)[:500]
+            offset += len(sentences)
+    return summaries
+
+
+def _extractive_summary(text: TextOrDocument, max_sentences: int = 3) -> str:
+    """TF-IDF extractive summary, used as the fast backend and as the AI fallback."""
+    return extractive_summaries([text], max_sentences=max_sentences)[0]
+
+
+def _get_article_text(url: str, deadline: Deadline) -> str:
+    return get_article(url, timeout=deadline.timeout(None)).text or ""
+
+
+def summarize_article(url: str, article_text: Optional[str] = None, max_sentences: int = 3,
+                      deadline: Optional[Deadline] = None) -> str:
     """Summarize an article prioritizing an AI model with extractive fallback."""
-    try:
-        text = article_text or _get_article_text(url)
-        if not text:
-            return "Unable to extract content from article."
+    return summarize_articles([(url, article_text)], max_sentences=max_sentences, deadline=deadline)[0]
 
-        ai_summary = generate_ai_summary(text)
-        if ai_summary:
-            return ai_summary
 
-        return _extractive_summary(text, max_sentences=max_sentences)
+def summarize_articles(articles: Sequence[Tuple[str, Optional[str]]], max_sentences: int = 3,
+                       deadline: Optional[Deadline] = None) -> List[str]:
+    """
+    Summarize (url, article_text) pairs in one batched model pass.
+
+    Past the `deadline`, articles the model hasn't reached get the (fast)
+    extractive summary instead of waiting for it.
+    """
+    deadline = deadline or Deadline()
+    documents = []
+    errors = {}
+    for index, (url, article_text) in enumerate(articles):
+        try:
+            documents.append(PreparedDocument(article_text or _get_article_text(url, deadline)))
+        except Exception as exc:
+            documents.append(PreparedDocument(""))
+            errors[index] = f"Summary unavailable. Error: {str(exc)[:100]}"
+
+    ai_summaries = generate_ai_summaries(documents, deadline=deadline)
+
+    # Articles the model didn't summarize go through one batched extractive pass,
+    # reusing the sentences already split for chunking
+    fallback = [index for index, (document, ai_summary) in enumerate(zip(documents, ai_summaries))
+                if index not in errors and document.text and not ai_summary]
+    try:
+        with timed("summarize_extractive"):
+            extracted = extractive_summaries([documents[index] for index in fallback], max_sentences=max_sentences)
     except Exception as exc:
-        return f"Summary unavailable. Error: {str(exc)[:100]}"
+        extracted = [f"Summary unavailable. Error: {str(exc)[:100]}"] * len(fallback)
+    extractive = dict(zip(fallback, extracted))
+
+    summaries = []
+    for index, (document, ai_summary) in enumerate(zip(documents, ai_summaries)):
+        if index in errors:
+            summaries.append(errors[index])
+        elif not document.text:
+            summaries.append("Unable to extract content from article.")
+        elif ai_summary:
+            summaries.append(ai_summary)
+        else:
+            summaries.append(extractive[index])
+    return summaries
 
 
 def extract_fdi_keywords(text: str):
@@ -137,6 +450,7 @@ def extract_fdi_keywords(text: str):
     """
     keywords = {
         'investment_amount': '',
+        'investment_amount_usd': None,
         'country': '',
         'sector': '',
         'company': ''
@@ -145,14 +459,16 @@ def extract_fdi_keywords(text: str):
     if not text:
         return keywords
 
-    amount_pattern = r'\$[\d,]+(?:\s*(?:million|billion|M|B))?'
-    amounts = re.findall(amount_pattern, text, re.IGNORECASE)
-    if amounts:
-        keywords['investment_amount'] = amounts[0]
+    amount = find_amount(text)
+    if amount:
+        keywords['investment_amount'] = amount.text
+        keywords['investment_amount_usd'] = amount.usd
+    keywords['company'] = find_company(text)
 
+    lowered = text.lower()
     countries = ['Argentina', 'Brazil', 'Chile', 'Colombia', 'Mexico', 'Peru']
     for country in countries:
-        if country.lower() in text.lower():
+        if country.lower() in lowered:
             keywords['country'] = country
             break
 
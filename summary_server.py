@@ -0,0 +1,87 @@
+"""
+Shared summarization model server.
+
+Loads the summarization model once and serves it over HTTP so several gunicorn
+workers (and the ingestion daemon) can run with FDI_SUMMARIZER_BACKEND=remote
+instead of each holding their own copy of the model in memory:
+
+    python summary_server.py --port 8765
+
+POST /summarize with {"chunks": [...], "batch_size": 8} returns {"summaries": [...]}.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from summarizer import LOCAL_BACKENDS, _BATCH_SIZE, run_summarization_model
+
+SERVER_BACKEND = os.environ.get('FDI_SUMMARY_SERVER_BACKEND', 'transformer').lower()
+
+# One inference at a time; the pipeline already batches within a request
+_INFERENCE_LOCK = threading.Lock()
+
+
+class SummaryHandler(BaseHTTPRequestHandler):
+    backend = SERVER_BACKEND
+
+    def _send_json(self, status: int, payload) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, {'status': 'ok', 'backend': self.backend})
+        else:
+            self._send_json(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/summarize':
+            self._send_json(404, {'error': 'not found'})
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            chunks = [str(chunk) for chunk in payload.get('chunks', [])]
+            batch_size = int(payload.get('batch_size', _BATCH_SIZE))
+        except (ValueError, TypeError) as exc:
+            self._send_json(400, {'error': f'invalid request: {exc}'})
+            return
+
+        try:
+            with _INFERENCE_LOCK:
+                summaries = run_summarization_model(chunks, batch_size, backend=self.backend) if chunks else []
+        except Exception as exc:
+            print(f"Error summarizing {len(chunks)} chunks: {exc}")
+            self._send_json(500, {'error': str(exc)})
+            return
+
+        self._send_json(200, {'summaries': summaries})
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Serve the summarization model to other processes.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--backend', default=SERVER_BACKEND, choices=LOCAL_BACKENDS)
+    args = parser.parse_args()
+
+    SummaryHandler.backend = args.backend
+    server = ThreadingHTTPServer((args.host, args.port), SummaryHandler)
+    print(f"Summary server ({args.backend}) listening on {args.host}:{args.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    try:
+        main()
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,30 @@
+import threading
+
+import app
+from jobs import JobQueue
+
+
+def test_backfill_does_not_take_search_workers(monkeypatch):
+    monkeypatch.setattr(app, 'job_queue', JobQueue(max_workers=1))
+    monkeypatch.setattr(app, 'backfill_queue', JobQueue(max_workers=1))
+    started, release = threading.Event(), threading.Event()
+
+    def backfill_job(job, start, end, restart):
+        started.set()
+        release.wait(5)
+
+    monkeypatch.setattr(app, '_run_backfill_job', backfill_job)
+    client = app.app.test_client()
+
+    try:
+        backfill = client.post('/api/backfill', json={'start': '2024-01-01', 'end': '2024-01-07'}).get_json()
+        assert started.wait(2)
+        searched = threading.Event()
+        app.job_queue.submit('search', lambda job: searched.set())
+        # The only search worker is free while the backfill is still running
+        assert searched.wait(2)
+
+        job = client.get(f"/api/jobs/{backfill['job_id']}").get_json()['job']
+        assert (job['kind'], job['status']) == ('backfill', 'running')
+    finally:
+        release.set()
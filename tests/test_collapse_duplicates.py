@@ -0,0 +1,37 @@
+import app
+from news_store import NewsStore
+
+STORY = ' '.join(
+    'Acme Energy will invest US$ 500 million in a new solar plant in northern Chile, creating '
+    'two thousand jobs during construction and supplying power to the national grid by 2027 '
+    'according to the company and the ministry of energy'.split()
+)
+
+
+def _item(url, source):
+    return {'url': url, 'title': 'Acme invests in Chile', 'source': source, 'content': STORY}
+
+
+def test_reseen_story_with_syndicated_copy(tmp_path, monkeypatch):
+    store = NewsStore(str(tmp_path / 'news.sqlite3'))
+    monkeypatch.setattr(app, 'news_store', store)
+
+    first = app._collapse_duplicates([_item('https://a.example/story', 'A')])
+    store.merge(first)
+
+    # The stored story comes back next to a syndicated copy from the same batch
+    items = app._collapse_duplicates([_item('https://a.example/story', 'A'), _item('https://b.example/copy', 'B')])
+    assert [item['url'] for item in items] == ['https://a.example/story']
+    assert 'sources' not in items[0]
+
+    store.merge(items)
+    (stored,), _ = store.query(10)
+    assert [source['url'] for source in stored['sources']] == ['https://a.example/story', 'https://b.example/copy']
+
+
+def test_new_story_collects_batch_copies(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'news_store', NewsStore(str(tmp_path / 'news.sqlite3')))
+
+    items = app._collapse_duplicates([_item('https://a.example/story', 'A'), _item('https://b.example/copy', 'B')])
+    assert len(items) == 1
+    assert [source['url'] for source in items[0]['sources']] == ['https://a.example/story', 'https://b.example/copy']
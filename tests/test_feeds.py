@@ -0,0 +1,111 @@
+import hashlib
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import feeds
+from cache import PersistentCache
+
+FEED_PATH = os.path.join(os.path.dirname(__file__), '..', 'benchmarks', 'fixtures', 'feed.xml')
+EXTRA_ITEM = b'''<item>
+<title>Peru copper mine expansion draws foreign direct investment - Reuters</title>
+<link>https://news.google.com/rss/articles/fixture-peru-copper</link>
+<pubDate>Wed, 13 Mar 2024 08:00:00 GMT</pubDate>
+<description>Peru copper</description>
+</item>
+</channel>'''
+
+
+class StubFeedServer:
+    """Serves one feed body with an ETag and answers matching If-None-Match with 304."""
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.delay = 0.0
+        self.requests = []
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests.append(dict(self.headers))
+                time.sleep(server.delay)
+                etag = '"%s"' % hashlib.sha1(server.body).hexdigest()
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/rss+xml; charset=utf-8')
+                self.send_header('Content-Length', str(len(server.body)))
+                self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(server.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        self.url = f'http://127.0.0.1:{self.httpd.server_address[1]}/rss'
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+@pytest.fixture
+def feed_server(tmp_path, monkeypatch):
+    monkeypatch.setattr(feeds, 'FEED_CACHE', PersistentCache(str(tmp_path / 'cache.sqlite3'), 'feeds'))
+    with open(FEED_PATH, 'rb') as handle:
+        server = StubFeedServer(handle.read())
+    yield server
+    server.close()
+
+
+def test_conditional_get_serves_cached_parse_on_304(feed_server):
+    first = feeds.fetch_feed(feed_server.url, consumer='ingest')
+    assert first.status == 200 and not first.from_cache
+    assert first.entries and len(first.new_entries) == len(first.entries)
+
+    second = feeds.fetch_feed(feed_server.url, consumer='ingest')
+    assert feed_server.requests[-1].get('If-None-Match') == '"%s"' % hashlib.sha1(feed_server.body).hexdigest()
+    assert second.status == 304 and second.from_cache
+    assert [entry.link for entry in second.entries] == [entry.link for entry in first.entries]
+    assert second.new_entries == []
+
+
+def test_changed_feed_hands_out_only_unseen_entries(feed_server):
+    first = feeds.fetch_feed(feed_server.url, consumer='ingest')
+    feed_server.body = feed_server.body.replace(b'</channel>', EXTRA_ITEM)
+
+    second = feeds.fetch_feed(feed_server.url, consumer='ingest')
+    assert second.status == 200 and not second.from_cache
+    assert len(second.entries) == len(first.entries) + 1
+    assert [entry.link for entry in second.new_entries] == ['https://news.google.com/rss/articles/fixture-peru-copper']
+
+
+def test_consumers_track_handed_out_entries_separately(feed_server):
+    # An interactive search polling the same feed must not hide entries from the ingest daemon
+    searched = feeds.fetch_feed(feed_server.url)
+    assert searched.entries and searched.new_entries == []
+
+    ingested = feeds.fetch_feed(feed_server.url, consumer='ingest')
+    assert [entry.link for entry in ingested.new_entries] == [entry.link for entry in searched.entries]
+    assert len(feeds.fetch_feed(feed_server.url, consumer='other').new_entries) == len(searched.entries)
+    assert feeds.fetch_feed(feed_server.url, consumer='ingest').new_entries == []
+
+
+def test_stalled_feed_times_out_to_cached_entries(feed_server):
+    first = feeds.fetch_feed(feed_server.url)
+    feed_server.body += b' '
+    feed_server.delay = 2.0
+
+    started = time.monotonic()
+    stalled = feeds.fetch_feed(feed_server.url, timeout=0.3)
+    assert time.monotonic() - started < 1.5
+    assert stalled.status is None and stalled.from_cache
+    assert [entry.link for entry in stalled.entries] == [entry.link for entry in first.entries]
@@ -0,0 +1,108 @@
+import time
+
+import pytest
+
+import ingest
+from cache import PersistentCache
+from feeds import FeedResult, _entry_from_dict
+
+
+def _entry(link, hours_ago):
+    published = time.gmtime(time.time() - hours_ago * 3600)
+    return _entry_from_dict({'link': link, 'title': link, 'published_parsed': list(published)})
+
+
+@pytest.fixture
+def daemon(tmp_path, monkeypatch):
+    monkeypatch.setattr(ingest, 'INGEST_STATE', PersistentCache(str(tmp_path / 'cache.sqlite3'), 'ingest_state'))
+    monkeypatch.setattr(ingest, '_prepare_news_items', lambda items: items)
+    monkeypatch.setattr(ingest, '_merge_news_items', lambda items: items)
+    polls = []
+    monkeypatch.setattr(ingest, 'fetch_feed', lambda url, consumer: polls.pop(0))
+    down = set()
+    scraped = []
+
+    def scrape(entries, failed):
+        scraped.append(sorted(entries))
+        failed.extend(link for link in entries if link in down)
+        return [{'url': link} for link in entries if link not in down]
+
+    monkeypatch.setattr(ingest, 'scrape_feed_entries', scrape)
+    return polls, down, scraped
+
+
+def _poll(*entries):
+    return FeedResult(url='feed', status=200, entries=list(entries), new_entries=list(entries))
+
+
+def test_failed_entries_are_retried_after_the_mark_moves_on(daemon):
+    polls, down, scraped = daemon
+    down.add('b')
+    polls.extend([_poll(_entry('a', 3), _entry('b', 2)), _poll(_entry('c', 1)), _poll()])
+
+    assert [item['url'] for item in ingest.ingest_feed('feed')] == ['a']
+    down.clear()
+    # 'b' is older than the new mark and no longer a new entry, but it is retried
+    assert sorted(item['url'] for item in ingest.ingest_feed('feed')) == ['b', 'c']
+    assert ingest.ingest_feed('feed') == []
+    assert scraped == [['a', 'b'], ['b', 'c']]
+
+
+def test_entries_are_dropped_after_max_attempts(daemon, monkeypatch):
+    polls, down, scraped = daemon
+    monkeypatch.setattr(ingest, 'INGEST_MAX_ATTEMPTS', 2)
+    down.add('a')
+    polls.extend([_poll(_entry('a', 1)), _poll(), _poll()])
+
+    for _ in range(3):
+        ingest.ingest_feed('feed')
+    assert scraped == [['a'], ['a']]
+
+
+def test_crash_during_scrape_retries_the_batch(daemon, monkeypatch):
+    polls, down, scraped = daemon
+    polls.extend([_poll(_entry('a', 1)), _poll()])
+
+    def crash(entries, failed):
+        raise RuntimeError('worker died')
+
+    with monkeypatch.context() as patch:
+        patch.setattr(ingest, 'scrape_feed_entries', crash)
+        with pytest.raises(RuntimeError):
+            ingest.ingest_feed('feed')
+    assert [item['url'] for item in ingest.ingest_feed('feed')] == ['a']
+
+
+def test_scrape_candidates_reports_failed_downloads(monkeypatch):
+    import news_scraper
+    from cache import ParsedArticle
+    from sources import Candidate
+
+    def fetch(url, deadline):
+        return None if url.endswith('down') else ParsedArticle(url=url, title='', text='')
+
+    monkeypatch.setattr(news_scraper, '_fetch_article', fetch)
+    candidates = [Candidate(link=f'https://example.com/{name}', title='FDI investment in Brazil')
+                  for name in ('up', 'down')]
+    failed = []
+    news_scraper.scrape_candidates(candidates, failed=failed)
+    assert failed == ['https://example.com/down']
+
+
+def test_prefilter_saves_only_dropped_candidates(monkeypatch):
+    import news_scraper
+    from cache import ParsedArticle
+    from sources import Candidate
+
+    def fetch(url, deadline):
+        return ParsedArticle(url=url, title='', text='Foreign direct investment in Brazil announced.')
+
+    monkeypatch.setattr(news_scraper, '_fetch_article', fetch)
+    monkeypatch.setattr(news_scraper, 'prefilter_stats', dict.fromkeys(news_scraper.prefilter_stats, 0))
+    candidates = [Candidate(link=f'https://example.com/{n}', title='FDI investment in Brazil') for n in range(3)]
+    candidates += [Candidate(link='https://example.com/off-topic', title='Weather today'),
+                   Candidate(link='https://example.com/web', origin='web', prefilter=False)]
+    # Stopping after the first item leaves candidates undownloaded, but the prefilter didn't skip them
+    news_scraper.scrape_candidates(candidates, num_results=1)
+    assert news_scraper.prefilter_stats['dropped'] == 1
+    assert news_scraper.prefilter_stats['saved'] == 1
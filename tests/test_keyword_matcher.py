@@ -0,0 +1,67 @@
+import random
+
+import pytest
+
+import news_scraper
+from news_scraper import (
+    DEAL_TERMS, EXCLUDE_KEYWORDS, FDI_CORE_KEYWORDS, KEYWORD_GROUPS, LATAM_COUNTRIES, SECTOR_KEYWORDS,
+    KeywordMatcher, _reference_countries_and_sectors, _reference_score_article_relevance, extract_fdi_details,
+    match_article, score_article_relevance,
+)
+
+KEYWORDS = (FDI_CORE_KEYWORDS + DEAL_TERMS + LATAM_COUNTRIES + EXCLUDE_KEYWORDS
+            + [keyword for keywords in SECTOR_KEYWORDS.values() for keyword in keywords])
+FILLER = ['the', 'said', 'again', 'support', 'development', 'plantation', 'brazilian', 'maintain', 'a', 'i']
+
+ENGINES = [pytest.param(False, id='regex')]
+if news_scraper.ahocorasick is not None:
+    ENGINES.append(pytest.param(True, id='automaton'))
+
+
+@pytest.fixture(params=ENGINES)
+def matcher(request, monkeypatch):
+    monkeypatch.setattr(news_scraper, 'KEYWORD_MATCHER', KeywordMatcher(KEYWORD_GROUPS, automaton=request.param))
+
+
+def _random_text(rng: random.Random, words: int) -> str:
+    parts = []
+    for _ in range(words):
+        word = rng.choice(KEYWORDS) if rng.random() < 0.3 else rng.choice(FILLER)
+        if rng.random() < 0.3:
+            word = word.upper() if rng.random() < 0.5 else word.title()
+        parts.append(word)
+    # Glue some words together so keywords overlap and run into each other
+    return ''.join(part + rng.choice([' ', ' ', ' ', '', '\n', ', ']) for part in parts)
+
+
+def _assert_matches_reference(title, summary, text):
+    expected_score = _reference_score_article_relevance(title, summary, text)
+    assert score_article_relevance(title, summary, text) == expected_score
+
+    matches = match_article(title, summary, text)
+    assert matches.relevance == expected_score
+    assert (matches.countries, matches.sectors) == _reference_countries_and_sectors(text or summary)
+
+    details = extract_fdi_details(text)
+    assert (details['countries'], details['sectors']) == _reference_countries_and_sectors(text)
+
+
+@pytest.mark.parametrize('seed', range(200))
+def test_matches_reference_on_random_texts(matcher, seed):
+    rng = random.Random(seed)
+    title, summary, text = (_random_text(rng, rng.randint(0, n)) for n in (8, 30, 300))
+    if rng.random() < 0.2:
+        text = ''
+    _assert_matches_reference(title, summary, text)
+
+
+@pytest.mark.parametrize('title,summary,text', [
+    ('', '', ''),
+    ('FDI in Brazil', '', ''),
+    ('Solar plant', 'Foreign direct investment in Costa Rica', 'plant expansion investment project'),
+    ('', 'Chile lithium', ''),
+    ('Investirá', 'inversión extranjera', 'AIRPORT portugal malaysia'),
+    ('Mexico', 'manufacturing', 'investment fundraising'),
+])
+def test_matches_reference_on_edge_cases(matcher, title, summary, text):
+    _assert_matches_reference(title, summary, text)
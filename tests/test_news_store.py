@@ -0,0 +1,58 @@
+import sys
+import threading
+
+from news_store import NewsRecord, NewsStore
+
+
+def _item(url, country):
+    return {'url': url, 'title': url, 'countries': [country], 'published': '2024-05-01', 'amount_usd': 1e6}
+
+
+def test_concurrent_merges_of_the_same_urls(tmp_path):
+    # Two stores on one file stand in for the ingest daemon and a web worker
+    path = str(tmp_path / 'news.sqlite3')
+    stores = [NewsStore(path), NewsStore(path)]
+    rounds = 30
+    barrier = threading.Barrier(len(stores))
+    errors = []
+
+    def merge(store, country):
+        try:
+            for index in range(rounds):
+                barrier.wait()
+                store.merge([_item(f'https://example.com/{index}', country)])
+                barrier.wait()
+                store.add_sources(f'https://example.com/{index}', [{'url': f'https://{country}.example/{index}'}])
+        except Exception as exc:
+            errors.append(exc)
+            barrier.abort()
+
+    threads = [threading.Thread(target=merge, args=(store, country))
+               for store, country in zip(stores, ('Brazil', 'Chile'))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    items = stores[0].all()
+    assert len(items) == rounds
+    assert all(len(item['sources']) == 2 for item in items)
+    stats = stores[0].stats()
+    assert stats['total']['count'] == rounds
+    assert sum(row['count'] for row in stats['country']) == rounds
+
+
+def test_record_interns_only_low_cardinality_fields():
+    def fresh(text):
+        # A string equal to `text` that is a new object, as parsed JSON would be
+        return ''.join(list(text))
+
+    record = NewsRecord.from_dict({
+        'url': 'https://example.com/a', 'source': fresh('Reuters x'), 'countries': [fresh('Brazil x')],
+        'published': fresh('2024-05-01 x'), 'collected_at': fresh('2024-05-02 10:00:00 x'),
+    })
+    assert sys.intern(fresh('Reuters x')) is record.source
+    assert sys.intern(fresh('Brazil x')) is record.countries[0]
+    assert sys.intern(fresh('2024-05-01 x')) is not record.published
+    assert sys.intern(fresh('2024-05-02 10:00:00 x')) is not record.collected_at
@@ -0,0 +1,31 @@
+import app
+from news_scraper import build_news_item
+from news_store import NewsStore
+
+TEXT = ('Acme Energy will invest US$ 500 million in a new solar plant in northern Chile. '
+        'The plant will supply power to the national grid by 2027.')
+
+
+def test_scraped_items_are_summarized_in_one_pass(tmp_path, monkeypatch):
+    monkeypatch.setattr(app, 'news_store', NewsStore(str(tmp_path / 'news.sqlite3')))
+    calls = []
+
+    def summarize_articles(articles, deadline=None):
+        calls.append(list(articles))
+        return [f'summary of {url}' for url, _ in articles]
+
+    monkeypatch.setattr(app, 'summarize_articles', summarize_articles)
+    items = [
+        build_news_item('Acme invests in Chile', 'https://a.example/story', TEXT[:600], '2024-05-01', 'A', TEXT),
+        build_news_item('Copper mine in Peru', 'https://b.example/story', 'FDI in a Peru copper mine',
+                        '2024-05-01', 'B', 'Mining group commits US$ 2 billion to a copper mine in Peru.'),
+        # Nothing was downloaded, so the feed snippet is the summary
+        build_news_item('Lithium in Argentina', 'https://c.example/story', 'Lithium investment in Argentina',
+                        '2024-05-01', 'C', ''),
+    ]
+
+    prepared = app._prepare_news_items(items)
+    assert calls == [[('https://a.example/story', items[0]['content']), ('https://b.example/story', items[1]['content'])]]
+    assert [item['summary'] for item in prepared] == [
+        'summary of https://a.example/story', 'summary of https://b.example/story', 'Lithium investment in Argentina',
+    ]
@@ -0,0 +1,114 @@
+import pytest
+
+import cache
+import news_scraper
+from cache import ParsedArticle, PersistentCache
+from news_scraper import HostUnavailable, _HostCircuitBreaker
+
+GOOGLE_LINK = 'https://news.google.com/rss/articles/{}'
+
+
+class _Redirect:
+    def __init__(self, location):
+        self.headers = {'Location': location} if location else {}
+        self.is_redirect = location is not None
+
+
+@pytest.fixture
+def scraper(tmp_path, monkeypatch):
+    path = str(tmp_path / 'cache.sqlite3')
+    monkeypatch.setattr(cache, 'ARTICLE_CACHE', PersistentCache(path, 'articles'))
+    monkeypatch.setattr(news_scraper, 'RESOLVED_URLS', PersistentCache(path, 'resolved_urls'))
+    monkeypatch.setattr(news_scraper, 'HOST_BREAKER', _HostCircuitBreaker(threshold=2, cooldown=600))
+    monkeypatch.setattr(news_scraper._HOST_LIMITER, 'delay', 0)
+    return news_scraper
+
+
+def _publishers(monkeypatch, targets, failing):
+    heads = []
+
+    def head(url, allow_redirects, timeout):
+        heads.append(url)
+        return _Redirect(targets.get(url))
+
+    def download(url, timeout=None):
+        if news_scraper._host(url) in failing:
+            raise OSError('timed out')
+        return ParsedArticle(url=url, title='t', text='body')
+
+    monkeypatch.setattr(news_scraper.requests, 'head', head)
+    monkeypatch.setattr(news_scraper, 'download_article', download)
+    return heads
+
+
+def test_breaker_keys_on_publisher_not_aggregator(scraper, monkeypatch):
+    targets = {GOOGLE_LINK.format(i): f'https://slow.example/story-{i}' for i in range(3)}
+    targets[GOOGLE_LINK.format('ok')] = 'https://www.fast.example/story'
+    heads = _publishers(monkeypatch, targets, failing={'slow.example'})
+
+    for i in range(2):
+        with pytest.raises(OSError):
+            scraper.parse_article(GOOGLE_LINK.format(i))
+    assert scraper.HOST_BREAKER.open_hosts() == ['slow.example']
+
+    with pytest.raises(HostUnavailable):
+        scraper.parse_article(GOOGLE_LINK.format(2))
+    article = scraper.parse_article(GOOGLE_LINK.format('ok'))
+    assert article.url == GOOGLE_LINK.format('ok')
+
+    # Resolutions are cached; the cached article needs no request at all
+    resolved = len(heads)
+    scraper.parse_article(GOOGLE_LINK.format('ok'))
+    assert len(heads) == resolved
+
+
+def test_unresolved_aggregator_links_never_open_the_breaker(scraper, monkeypatch):
+    _publishers(monkeypatch, {}, failing={'news.google.com'})
+
+    for i in range(3):
+        with pytest.raises(OSError):
+            scraper.parse_article(GOOGLE_LINK.format(i))
+    assert scraper.HOST_BREAKER.open_hosts() == []
+
+
+def test_host_timeout_applies_to_publisher(scraper, monkeypatch):
+    monkeypatch.setitem(scraper.HOST_TIMEOUTS, 'fast.example', 2.0)
+    timeouts = []
+    monkeypatch.setattr(scraper.requests, 'head', lambda url, **kwargs: _Redirect('https://www.fast.example/a'))
+    monkeypatch.setattr(scraper, 'download_article',
+                        lambda url, timeout=None: timeouts.append(timeout) or ParsedArticle(url=url, title='', text=''))
+
+    scraper.parse_article(GOOGLE_LINK.format('t'))
+    assert timeouts == [2.0]
+
+
+class _RecordingLimiter(news_scraper._HostRateLimiter):
+    def __init__(self):
+        super().__init__(delay=0)
+        self.waits = []
+
+    def wait(self, host):
+        self.waits.append(host)
+
+
+def test_rate_limit_slots_are_per_publisher(scraper, monkeypatch):
+    limiter = _RecordingLimiter()
+    monkeypatch.setattr(scraper, '_HOST_LIMITER', limiter)
+    targets = {GOOGLE_LINK.format('a'): 'https://a.example/1', GOOGLE_LINK.format('b'): 'https://www.b.example/2'}
+    _publishers(monkeypatch, targets, failing=set())
+
+    # Redirect lookups queue for news.google.com; the downloads for each publisher
+    scraper.parse_article(GOOGLE_LINK.format('a'))
+    scraper.parse_article(GOOGLE_LINK.format('b'))
+    assert limiter.waits == ['news.google.com', 'a.example', 'news.google.com', 'b.example']
+
+
+def test_every_redirect_hop_waits_for_its_host(scraper, monkeypatch):
+    limiter = _RecordingLimiter()
+    monkeypatch.setattr(scraper, '_HOST_LIMITER', limiter)
+    hop = 'https://news.google.com/articles/hop'
+    heads = _publishers(monkeypatch, {GOOGLE_LINK.format('a'): hop, hop: 'https://a.example/1'}, failing=set())
+
+    assert scraper.resolve_publisher_url(GOOGLE_LINK.format('a')) == 'https://a.example/1'
+    assert heads == [GOOGLE_LINK.format('a'), hop]
+    assert limiter.waits == ['news.google.com', 'news.google.com']
@@ -0,0 +1,19 @@
+import pytest
+
+import app
+
+
+@pytest.mark.parametrize('deadline', [0, 0.0, -5, '0'])
+def test_non_positive_deadline_is_rejected(deadline, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(app.job_queue, 'submit', lambda *args: submitted.append(args))
+
+    response = app.app.test_client().post('/api/search', json={'query': 'FDI', 'deadline': deadline})
+    assert response.status_code == 400
+    assert 'Invalid deadline' in response.get_json()['error']
+    assert submitted == []
+
+
+def test_missing_deadline_uses_the_default():
+    assert app._request_deadline({}) == min(app.SEARCH_DEADLINE, app.MAX_SEARCH_DEADLINE)
+    assert app._request_deadline({'deadline': None}) == min(app.SEARCH_DEADLINE, app.MAX_SEARCH_DEADLINE)
@@ -0,0 +1,84 @@
+import sys
+import time
+import types
+
+import pytest
+
+import summarizer
+
+
+@pytest.fixture
+def tokenizer_loads(monkeypatch):
+    loads = []
+
+    class AutoTokenizer:
+        @staticmethod
+        def from_pretrained(name):
+            loads.append(name)
+            raise OSError('no tokenizer files here')
+
+    monkeypatch.setitem(sys.modules, 'transformers', types.SimpleNamespace(AutoTokenizer=AutoTokenizer))
+    summarizer._get_tokenizer.cache_clear()
+    yield loads
+    summarizer._get_tokenizer.cache_clear()
+
+
+@pytest.mark.parametrize('backend', ['remote', 'extractive'])
+def test_workers_without_a_local_model_never_load_the_tokenizer(tokenizer_loads, monkeypatch, backend):
+    monkeypatch.setattr(summarizer, 'SUMMARIZER_BACKEND', backend)
+    monkeypatch.setattr(summarizer, 'sent_tokenize', lambda text: text.split('. '))
+    document = summarizer.PreparedDocument('Brazil lands a new plant. Investment tops one billion dollars')
+
+    assert document.token_counts == [len(s.split()) * 4 // 3 + 1 for s in document.sentences]
+    assert summarizer._chunk_token_budget() == summarizer._CHUNK_TOKENS
+    assert tokenizer_loads == []
+
+
+def test_local_backend_loads_the_tokenizer(tokenizer_loads, monkeypatch):
+    monkeypatch.setattr(summarizer, 'SUMMARIZER_BACKEND', 'transformer')
+    assert summarizer._get_tokenizer() is None
+    assert tokenizer_loads == [summarizer._SUMMARIZER_MODEL]
+
+
+class _Health:
+    def __init__(self, backend):
+        self.backend = backend
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return {'status': 'ok', 'backend': self.backend}
+
+
+def test_cache_key_covers_chunk_size_and_serving_backend(monkeypatch):
+    served = []
+    monkeypatch.setattr(summarizer.requests, 'get', lambda url, timeout: _Health(served[-1]))
+    monkeypatch.setattr(summarizer, '_remote_backend', (None, 0.0))
+    monkeypatch.setattr(summarizer, 'SUMMARIZER_BACKEND', 'remote')
+
+    def key():
+        return summarizer._summary_cache_key('article text', summarizer._serving_backend())
+
+    served.append('transformer')
+    remote_transformer = key()
+    # The server restarted with another backend; the worker notices once the reported one expires
+    served.append('quantized')
+    monkeypatch.setattr(summarizer, '_remote_backend', ('transformer', time.monotonic() - 61))
+    remote_quantized = key()
+    monkeypatch.setattr(summarizer, 'SUMMARIZER_BACKEND', 'transformer')
+    local = key()
+    assert len({remote_transformer, remote_quantized, local}) == 3
+    monkeypatch.setattr(summarizer, '_CHUNK_TOKENS', summarizer._CHUNK_TOKENS // 2)
+    assert key() != local
+
+
+def test_unreachable_summary_server_falls_back_without_posting(monkeypatch):
+    def unreachable(url, **kwargs):
+        raise summarizer.requests.ConnectionError('refused')
+
+    monkeypatch.setattr(summarizer.requests, 'get', unreachable)
+    monkeypatch.setattr(summarizer.requests, 'post', unreachable)
+    monkeypatch.setattr(summarizer, '_remote_backend', (None, 0.0))
+    monkeypatch.setattr(summarizer, 'SUMMARIZER_BACKEND', 'remote')
+    assert summarizer.generate_ai_summaries(['word ' * 50]) == [None]